@@ -4,12 +4,47 @@
 Simple file-based cache for agent requests.
 """
 
+import hashlib
 import json
 import os
+import threading
 import time
+from collections import OrderedDict
 from typing import Any, Optional
 
 
+def content_key(*parts: str) -> str:
+    """Hash text parts into a cache key, so equal inputs share an entry across runs."""
+    hasher = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        hasher.update(part.encode("utf-8", "surrogatepass"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+class MemoryCache:
+    """Small thread-safe in-process LRU map, used in front of the file cache."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(cache_key)
+            if value is not None:
+                self._entries.move_to_end(cache_key)
+            return value
+
+    def put(self, cache_key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[cache_key] = value
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
 def _cache_path(cache_dir: str, cache_key: str) -> str:
     return os.path.join(cache_dir, f"{cache_key}.json")
 
@@ -36,8 +71,31 @@ def save_cache(cache_dir: str, cache_key: str, payload: Any) -> None:
         return
     os.makedirs(cache_dir, exist_ok=True)
     path = _cache_path(cache_dir, cache_key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
     except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def prune_cache(cache_dir: str, max_entries: int) -> None:
+    """Remove the least recently written entries beyond max_entries."""
+    if not cache_dir or max_entries <= 0:
+        return
+    try:
+        entries = [e for e in os.scandir(cache_dir) if e.name.endswith(".json")]
+    except OSError:
+        return
+    if len(entries) <= max_entries:
         return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - max_entries]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
@@ -7,8 +7,12 @@ Generates JSON/HTML/Markdown reports with separated static and dynamic sections.
 
 import json
 import os
+import threading
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Union
+
+
+_WRITE_BUFFER_SIZE = 64 * 1024
 
 
 def _count(items: Any) -> int:
@@ -133,6 +137,14 @@ def generate_json_report(analysis_results: Dict[str, Any]) -> str:
     """
     Generate JSON format report with separated static/dynamic summaries.
     """
+    return ''.join(iter_json_report(analysis_results))
+
+
+def iter_json_report(analysis_results: Dict[str, Any]) -> Iterator[str]:
+    """
+    Same document as generate_json_report, produced as text chunks so it can
+    be written out without building the whole string first.
+    """
     report_sections: Dict[str, Any] = {}
     analysis_type = analysis_results.get('analysis_type')
 
@@ -171,7 +183,8 @@ def generate_json_report(analysis_results: Dict[str, Any]) -> str:
         'report_sections': report_sections
     }
 
-    return json.dumps(report_data, indent=2, ensure_ascii=False)
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    yield from encoder.iterencode(report_data)
 
 
 def generate_html_report(analysis_results: Dict[str, Any]) -> str:
@@ -986,12 +999,12 @@ def generate_markdown_report(analysis_results: Dict[str, Any]) -> str:
 
 
 def save_report(
-    report_content: str,
+    report_content: Union[str, Iterable[str]],
     file_path: str,
     format: str = 'json'
 ) -> str:
     """
-    保存报告到文件
+    保存报告到文件（report_content 可以是字符串，也可以是逐块产生的文本）
     """
     report_dir = os.path.dirname(file_path)
     if report_dir:
@@ -1000,7 +1013,22 @@ def save_report(
     if not file_path.endswith(f'.{format}'):
         file_path = f"{file_path}.{format}"
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(report_content)
+    # Chunked content is encoded while it is written; write to a temporary name and
+    # move it into place so an encoding error never leaves a truncated report
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            if isinstance(report_content, str):
+                f.write(report_content)
+            else:
+                for chunk in report_content:
+                    f.write(chunk)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
 
     return file_path
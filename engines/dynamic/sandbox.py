@@ -17,6 +17,9 @@ import queue
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+# Bound on queued hook log entries; the hook runtime drops the oldest beyond this.
+_LOG_QUEUE_MAXSIZE = 65536
+
 
 def _create_hook_runner_script(target_file: str, args: List[str], log_file: str) -> str:
     """
@@ -110,7 +113,7 @@ def _execute_with_hooks(
     result_queue: mp.Queue
 ) -> None:
     """Execute target file with hooks installed and send results back via queue."""
-    from engines.dynamic.syscall_monitor import install_hooks
+    from engines.dynamic.syscall_monitor import install_hooks, flush_hook_logs
     file_path = os.path.abspath(file_path)
     target_dir = os.path.dirname(file_path)
 
@@ -140,6 +143,9 @@ def _execute_with_hooks(
         return_code = -1
         import traceback
         traceback.print_exc(file=stderr_io)
+    finally:
+        # Worker processes skip atexit handlers, so flush explicitly
+        flush_hook_logs()
 
     execution_time = time.time() - start_time
     result_queue.put({
@@ -181,14 +187,26 @@ def run_in_sandbox(
         args = []
     
     if log_mode == "queue":
-        log_queue: mp.Queue = mp.Queue()
+        log_queue: mp.Queue = mp.Queue(maxsize=_LOG_QUEUE_MAXSIZE)
         result_queue: mp.Queue = mp.Queue()
         worker = mp.Process(
             target=_execute_with_hooks,
             args=(file_path, args or [], log_queue, result_queue)
         )
         worker.start()
-        worker.join(timeout)
+
+        # Drain while waiting: a worker cannot exit until its queued entries reach the pipe
+        log_entries: List[str] = []
+        result = {}
+        deadline = time.time() + timeout
+        while worker.is_alive() and time.time() < deadline:
+            worker.join(0.05)
+            log_entries.extend(_drain_queue(log_queue))
+            if not result:
+                try:
+                    result = result_queue.get_nowait()
+                except Exception:
+                    result = {}
 
         timed_out = False
         if worker.is_alive():
@@ -196,14 +214,14 @@ def run_in_sandbox(
             worker.terminate()
             worker.join(1)
 
-        result = {}
-        try:
-            if not result_queue.empty():
-                result = result_queue.get_nowait()
-        except Exception:
-            result = {}
+        if not result:
+            try:
+                if not result_queue.empty():
+                    result = result_queue.get_nowait()
+            except Exception:
+                result = {}
 
-        log_entries = _drain_queue(log_queue)
+        log_entries.extend(_drain_queue(log_queue))
         return {
             'return_code': result.get('return_code', -1),
             'stdout': result.get('stdout', ''),
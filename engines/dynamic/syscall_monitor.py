@@ -5,19 +5,130 @@ System Call Monitor
 Core hooking logic using Monkey Patch to intercept dangerous system calls.
 """
 
+import atexit
+import functools
+import heapq
 import os
+import queue
+import re
 import socket
 import subprocess
 import sys
-import traceback
+import time
 from datetime import datetime
-from typing import Optional, Callable, Any
+from collections import OrderedDict, deque
+from typing import Optional, Callable, Any, Deque, List, Tuple
 import threading
 from engines.dynamic.file_monitor import FileMonitor
 
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None
+
+# Flush the persistent log handle after this many buffered entries.
+_LOG_FLUSH_EVERY = 64
+# Flush the persistent log handle if this many seconds passed since last flush.
+_LOG_FLUSH_INTERVAL = 0.5
+# Upper bound on buffers handed to a single writev() call.
+_IOV_MAX = 1024
+# Pending file-mode entries kept per thread; the oldest are dropped beyond this.
+_THREAD_BUFFER_MAXLEN = 4096
+# Identical file events within this window are coalesced into one summary entry.
+_DEDUP_WINDOW_NS = 1_000_000_000
+# Number of distinct recent file events remembered for deduplication.
+_DEDUP_MAX_KEYS = 1024
+
+
+def _write_batch(fd: int, chunks: List[bytes]):
+    """Write encoded log entries to fd, using writev() where the platform has it."""
+    writev = getattr(os, 'writev', None)
+    for start in range(0, len(chunks), _IOV_MAX):
+        group = chunks[start:start + _IOV_MAX]
+        expected = sum(len(chunk) for chunk in group)
+        written = writev(fd, group) if writev is not None else 0
+        if written < expected:
+            # Short or unavailable writev: fall back to plain writes for the remainder.
+            remaining = memoryview(b"".join(group))[written:]
+            while remaining:
+                remaining = remaining[os.write(fd, remaining):]
+
+
+def _trusted_read_prefixes() -> Tuple[str, ...]:
+    """Interpreter install directories (stdlib, site-packages) whose reads are skipped."""
+    prefixes = []
+    for prefix in (sys.prefix, sys.base_prefix, sys.exec_prefix, sys.base_exec_prefix):
+        if not prefix:
+            continue
+        prefix = os.path.realpath(prefix)
+        # Never trust a filesystem root, that would hide every read
+        if os.path.dirname(prefix) == prefix:
+            continue
+        prefix = os.path.join(prefix, '')
+        if prefix not in prefixes:
+            prefixes.append(prefix)
+    return tuple(prefixes)
+
+
+class _LazyStr:
+    """Defers str() of a log argument until the entry is formatted; empty values render as ''."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        return str(self.value) if self.value else ""
+
+
+def _build_sensitive_matcher(sensitive_files: List[str]) -> Any:
+    """
+    Build a matcher that tests all sensitive substrings in one scan.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, otherwise
+    a regex alternation. Returns None for an empty list.
+    """
+    if not sensitive_files:
+        return None
+    if ahocorasick is not None:
+        try:
+            automaton = ahocorasick.Automaton()
+            for sensitive in sensitive_files:
+                automaton.add_word(sensitive, sensitive)
+            automaton.make_automaton()
+            return automaton
+        except Exception:
+            pass
+    return re.compile('|'.join(re.escape(s) for s in sensitive_files))
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_sensitive_path(matcher: Any, file_path: str) -> bool:
+    """Memoized sensitive-path check; open() hooks see the same paths repeatedly."""
+    if matcher is None:
+        return False
+    if isinstance(matcher, re.Pattern):
+        return matcher.search(file_path) is not None
+    return next(matcher.iter(file_path), None) is not None
+
 
 class HookedRuntime:
     """Manages hooks for system calls and network operations."""
+
+    # Log line templates; arguments are only formatted when an entry is written.
+    _FMT_FILE_ALERT = "[ALERT] FILE {}: {} (mode: {}){}{}"
+    _FMT_FILE_INFO = "[INFO] FILE {}: {} (mode: {}){}{}"
+    _FMT_SYSTEM = "[ALERT] SYSCALL: os.system called with command='{}' | stack={}"
+    _FMT_POPEN = "[ALERT] SYSCALL: os.popen called with command='{}', mode='{}' | stack={}"
+    _FMT_SOCKET = "[ALERT] NETWORK: socket.{} called with address='{}' | stack={}"
+    _FMT_SUBPROCESS = "[ALERT] SYSCALL: subprocess.{} called with args={}, kwargs={} | stack={}"
+    _FMT_CODE_EXEC = "[ALERT] CODE_EXEC: {} called with source='{}' | stack={}"
+    _FMT_COMPILE = "[ALERT] CODE_EXEC: compile called with source='{}', filename='{}', mode='{}' | stack={}"
+    _FMT_DLL = "[ALERT] MEMORY: ctypes.{} loaded '{}' | stack={}"
+    _FMT_MMAP = "[ALERT] MEMORY: mmap.mmap called with args={}, kwargs={} | stack={}"
+    _FMT_DEDUP = "[INFO] DEDUP: suppressed {} repeated {} events for {}"
+    _FMT_DROPPED = "[WARN] dropped {} log entries"
     
     def __init__(self, log_file: Optional[str] = None, log_queue: Optional[Any] = None):
         """
@@ -31,6 +142,27 @@ class HookedRuntime:
         self.log_lock = threading.Lock()
         self.hooks_installed = False
         self._file_monitor = FileMonitor(None)
+        self._sensitive_matcher = _build_sensitive_matcher(self._file_monitor.sensitive_files)
+        # Fast path: reads under the interpreter's own directories and the hook log itself
+        # are not audited. Writes there (e.g. dropping .pth files) are still logged.
+        self._trusted_read_prefixes = _trusted_read_prefixes()
+        self._trusted_files = frozenset([os.path.realpath(log_file)] if log_file else [])
+        self._log_fd = None
+        # Each thread appends to its own buffer; the drain merges them by timestamp.
+        self._log_tls = threading.local()
+        # Set while a thread is logging a hooked call; nested hooked calls bypass logging
+        self._hook_tls = threading.local()
+        self._thread_buffers: List[Tuple[threading.Thread, Deque[Tuple[int, str, Tuple[Any, ...]]]]] = []
+        self._log_dropped = 0
+        # (operation, path) -> [suppressed count, window start ns]
+        self._recent_events: 'OrderedDict[Tuple[str, str], List[int]]' = OrderedDict()
+        self._dedup_lock = threading.Lock()
+        self._timestamp_cache: Tuple[int, str] = (-1, "")
+        self._log_io_lock = threading.Lock()
+        self._log_last_flush = 0.0
+        # Background flusher so batched entries reach disk without a later event
+        self._log_flusher: Optional[threading.Thread] = None
+        self._log_flusher_stop = threading.Event()
         
         # Store original functions
         self._original_system = None
@@ -51,8 +183,12 @@ class HookedRuntime:
         self._original_ctypes_cdll = None
         self._original_ctypes_windll = None
         self._original_mmap = None
+        self._original_stat = None
         self._ctypes_module = None
         self._mmap_module = None
+        self._has_windll = False
+        # filename -> exists, for compile() calls on real source files
+        self._compile_file_exists: 'OrderedDict[str, bool]' = OrderedDict()
     
     def _safe_open(self, *args, **kwargs):
         """Open files using the original open to avoid hook recursion."""
@@ -87,13 +223,76 @@ class HookedRuntime:
         return "read"
 
     def _is_sensitive_file(self, file_path: str) -> bool:
-        return any(sensitive in file_path for sensitive in self._file_monitor.sensitive_files)
+        return _is_sensitive_path(self._sensitive_matcher, file_path)
+
+    def _is_trusted_path(self, file_path: str, operation: str) -> bool:
+        """Return True if the file operation needs no auditing."""
+        # Sensitive files are always audited, whatever directory they are reached through
+        if self._is_sensitive_file(file_path):
+            return False
+        try:
+            # Resolve '..' and symlinks so a path cannot borrow a trusted prefix
+            real_path = os.path.realpath(file_path)
+        except Exception:
+            return False
+        if real_path != file_path and self._is_sensitive_file(real_path):
+            return False
+        if real_path in self._trusted_files:
+            return True
+        return operation == "read" and real_path.startswith(self._trusted_read_prefixes)
+
+    def _is_duplicate_event(self, operation: str, file_path: str) -> bool:
+        """Return True if the same file event was already logged within the dedup window."""
+        # Every sensitive-file access stays an ALERT of its own
+        if self._is_sensitive_file(file_path):
+            return False
+        key = (operation, file_path)
+        now = time.monotonic_ns()
+        evicted = None
+        with self._dedup_lock:
+            entry = self._recent_events.get(key)
+            if entry is not None:
+                self._recent_events.move_to_end(key)
+                if now - entry[1] < _DEDUP_WINDOW_NS:
+                    entry[0] += 1
+                    return True
+                if entry[0]:
+                    evicted = (key, entry[0])
+                entry[0] = 0
+                entry[1] = now
+            else:
+                self._recent_events[key] = [0, now]
+                if len(self._recent_events) > _DEDUP_MAX_KEYS:
+                    old_key, old_entry = self._recent_events.popitem(last=False)
+                    if old_entry[0]:
+                        evicted = (old_key, old_entry[0])
+        if evicted is not None:
+            (old_operation, old_path), count = evicted
+            self._log(self._FMT_DEDUP, count, old_operation.upper(), self._truncate_value(old_path))
+        return False
+
+    def _flush_suppressed_events(self, force: bool = False):
+        """Log summaries for coalesced file events whose window has closed (or all, if force)."""
+        now = time.monotonic_ns()
+        summaries = []
+        with self._dedup_lock:
+            for (operation, file_path), entry in self._recent_events.items():
+                if entry[0] and (force or now - entry[1] >= _DEDUP_WINDOW_NS):
+                    summaries.append((entry[0], operation.upper(), file_path))
+                    entry[0] = 0
+        for count, operation, file_path in summaries:
+            self._log(self._FMT_DEDUP, count, operation, self._truncate_value(file_path))
 
     def _log_file_operation(self, operation: str, file_path: str, mode: str = "", stack: str = ""):
-        safe_path = self._truncate_value(file_path)
-        level = "[ALERT]" if self._is_sensitive_file(file_path) else "[INFO]"
-        stack_info = f" | stack={stack}" if stack else ""
-        self._log(f"{level} FILE {operation.upper()}: {safe_path} (mode: {mode}){stack_info}")
+        template = self._FMT_FILE_ALERT if self._is_sensitive_file(file_path) else self._FMT_FILE_INFO
+        self._log(
+            template,
+            operation.upper(),
+            self._truncate_value(file_path),
+            mode,
+            " | stack=" if stack else "",
+            stack
+        )
 
     def _format_code_source(self, source: Any) -> str:
         if isinstance(source, bytes):
@@ -107,41 +306,229 @@ class HookedRuntime:
             return f"code:{getattr(source, 'co_filename', '<unknown>')}"
         return f"<{type(source).__name__}>"
 
-    def _log(self, message: str):
-        """Write log entry to file or stdout."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        if self.log_queue is not None:
+    def _format_timestamp(self, timestamp_ns: int) -> str:
+        """Format a time.time_ns() value, reusing the strftime prefix within a second."""
+        seconds, remainder = divmod(timestamp_ns, 1_000_000_000)
+        cached_second, prefix = self._timestamp_cache
+        if cached_second != seconds:
+            prefix = datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M:%S")
+            self._timestamp_cache = (seconds, prefix)
+        return f"{prefix}.{remainder // 1_000_000:03d}"
+
+    def _format_entry(self, timestamp_ns: int, template: str, args: Tuple[Any, ...]) -> str:
+        message = template
+        if args:
             try:
-                self.log_queue.put(log_entry)
+                message = template.format(*args)
             except Exception:
-                pass
+                message = f"{template} <unprintable args>"
+        return f"[{self._format_timestamp(timestamp_ns)}] {message}\n"
+
+    def _log(self, message: str, *args: Any):
+        """
+        Write log entry to file or stdout.
+        
+        Args:
+            message: Log message, or a str.format template when args are given
+            args: Template arguments, formatted only when the entry is written
+        """
+        timestamp_ns = time.time_ns()
+        
+        if self.log_queue is not None:
+            self._put_log_queue(self._format_entry(timestamp_ns, message, args))
         elif self.log_file:
             try:
-                with self.log_lock:
-                    with self._safe_open(self.log_file, 'a', encoding='utf-8') as f:
-                        f.write(log_entry)
+                if self._log_fd is None:
+                    with self.log_lock:
+                        with self._safe_open(self.log_file, 'a', encoding='utf-8') as f:
+                            f.write(self._format_entry(timestamp_ns, message, args))
+                    return
+                # Timestamps are formatted when the batch is drained, not per event.
+                buffer = self._thread_buffer()
+                if len(buffer) == _THREAD_BUFFER_MAXLEN:
+                    # The deque evicts its oldest entry on append
+                    self._log_dropped += 1
+                buffer.append((timestamp_ns, message, args))
+                # Alerts and file writes/deletes are flushed right away so a killed
+                # target cannot lose them; other info entries wait for a batch.
+                if not message.startswith("[INFO]") or (
+                        message is self._FMT_FILE_INFO and args[0] != "READ"):
+                    self._drain_log_buffer()
+                elif (len(buffer) >= _LOG_FLUSH_EVERY
+                        or time.monotonic() - self._log_last_flush >= _LOG_FLUSH_INTERVAL):
+                    # Another thread already draining will pick these entries up.
+                    self._drain_log_buffer(blocking=False)
             except Exception as e:
                 # Don't fail if logging fails
                 sys.stderr.write(f"Logging error: {e}\n")
         else:
-            sys.stdout.write(log_entry)
+            sys.stdout.write(self._format_entry(timestamp_ns, message, args))
+
+    def _put_log_queue(self, log_entry: str):
+        """Put an entry on the log queue without blocking, dropping the oldest when full."""
+        try:
+            self.log_queue.put_nowait(log_entry)
+            return
+        except queue.Full:
+            pass
+        except Exception:
+            return
+        self._log_dropped += 1
+        try:
+            self.log_queue.get_nowait()
+        except Exception:
+            pass
+        try:
+            self.log_queue.put_nowait(log_entry)
+        except Exception:
+            pass
+
+    def _take_dropped_entry(self) -> Optional[str]:
+        """Return a warning entry for log entries dropped since the last call, if any."""
+        count, self._log_dropped = self._log_dropped, 0
+        if not count:
+            return None
+        return self._format_entry(time.time_ns(), self._FMT_DROPPED, (count,))
+
+    def _thread_buffer(self) -> Deque[Tuple[int, str, Tuple[Any, ...]]]:
+        """Return the calling thread's log buffer, registering it on first use."""
+        buffer = getattr(self._log_tls, 'buffer', None)
+        if buffer is None:
+            buffer = deque(maxlen=_THREAD_BUFFER_MAXLEN)
+            self._log_tls.buffer = buffer
+            with self.log_lock:
+                self._thread_buffers.append((threading.current_thread(), buffer))
+        return buffer
+
+    def _drain_log_buffer(self, blocking: bool = True):
+        """Merge all per-thread buffers by timestamp and write them with a single vectored write."""
+        if not self._log_io_lock.acquire(blocking):
+            return
+        try:
+            self._log_last_flush = time.monotonic()
+            self._flush_suppressed_events()
+            with self.log_lock:
+                buffers = list(self._thread_buffers)
+            batches = []
+            for _, buffer in buffers:
+                # popleft() is atomic, so owners can keep appending meanwhile
+                entries = []
+                while buffer:
+                    entries.append(buffer.popleft())
+                if entries:
+                    batches.append(entries)
+            with self.log_lock:
+                self._thread_buffers = [
+                    (thread, buffer) for thread, buffer in self._thread_buffers
+                    if buffer or thread.is_alive()
+                ]
+            if self.log_queue is not None:
+                dropped_entry = self._take_dropped_entry()
+                if dropped_entry:
+                    self._put_log_queue(dropped_entry)
+                return
+            fd = self._log_fd
+            if fd is None:
+                return
+            chunks = []
+            if batches:
+                merged = batches[0] if len(batches) == 1 else heapq.merge(*batches, key=lambda entry: entry[0])
+                chunks = [
+                    self._format_entry(timestamp_ns, message, args).encode('utf-8', 'replace')
+                    for timestamp_ns, message, args in merged
+                ]
+            dropped_entry = self._take_dropped_entry()
+            if dropped_entry:
+                chunks.append(dropped_entry.encode('utf-8', 'replace'))
+            if chunks:
+                _write_batch(fd, chunks)
+        finally:
+            self._log_io_lock.release()
+
+    def _open_log_handle(self):
+        """Open the log file once so each entry avoids an open/close pair."""
+        if not self.log_file or self.log_queue is not None or self._log_fd is not None:
+            return
+        open_func = self._original_os_open or os.open
+        try:
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+            self._log_fd = open_func(self.log_file, flags, 0o644)
+            self._log_last_flush = time.monotonic()
+            atexit.register(self._close_log_handle)
+            self._log_flusher_stop.clear()
+            self._log_flusher = threading.Thread(
+                target=self._flush_periodically, name='hook-log-flush', daemon=True
+            )
+            self._log_flusher.start()
+        except Exception as e:
+            self._log_fd = None
+            sys.stderr.write(f"Logging error: {e}\n")
+
+    def _flush_periodically(self):
+        """Drain batched entries every _LOG_FLUSH_INTERVAL until the handle is closed."""
+        while not self._log_flusher_stop.wait(_LOG_FLUSH_INTERVAL):
+            try:
+                self._drain_log_buffer(blocking=False)
+            except Exception as e:
+                sys.stderr.write(f"Logging error: {e}\n")
+
+    def _close_log_handle(self):
+        """Flush pending entries and close the persistent log handle."""
+        self._log_flusher_stop.set()
+        try:
+            self._flush_suppressed_events(force=True)
+            self._drain_log_buffer()
+        except Exception as e:
+            sys.stderr.write(f"Logging error: {e}\n")
+        with self._log_io_lock:
+            fd = self._log_fd
+            self._log_fd = None
+        if fd is None:
+            return
+        try:
+            os.close(fd)
+        except Exception:
+            pass
+        try:
+            atexit.unregister(self._close_log_handle)
+        except Exception:
+            pass
     
     def _get_call_stack(self) -> str:
         """Get simplified call stack for debugging."""
         try:
-            stack = traceback.extract_stack()
-            # Get last 3 frames (excluding this function)
-            frames = stack[-4:-1] if len(stack) > 4 else stack[:-1]
-            return " -> ".join([f"{f.filename}:{f.lineno}" for f in frames])
-        except:
+            # Walk the last 3 frames (excluding this function) directly instead of
+            # traceback.extract_stack(), which summarizes every frame on the stack
+            frame = sys._getframe(1)
+            frames = []
+            while frame is not None and len(frames) < 3:
+                frames.append(f"{frame.f_code.co_filename}:{frame.f_lineno}")
+                frame = frame.f_back
+            frames.reverse()
+            return " -> ".join(frames)
+        except Exception:
             return "unknown"
+
+    def _enter_hook(self) -> bool:
+        """Mark the current thread as logging a hooked call; False if it already is."""
+        tls = self._hook_tls
+        if getattr(tls, 'in_hook', False):
+            return False
+        tls.in_hook = True
+        return True
+
+    def _exit_hook(self):
+        self._hook_tls.in_hook = False
     
     def _hooked_system(self, command: str) -> int:
         """Hook for os.system()."""
-        stack = self._get_call_stack()
-        self._log(f"[ALERT] SYSCALL: os.system called with command='{command}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_system(command)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_SYSTEM, command, stack)
+        finally:
+            self._exit_hook()
         
         # Execute original function
         try:
@@ -152,8 +539,13 @@ class HookedRuntime:
     
     def _hooked_popen(self, command: str, mode: str = 'r', buffering: int = -1) -> Any:
         """Hook for os.popen()."""
-        stack = self._get_call_stack()
-        self._log(f"[ALERT] SYSCALL: os.popen called with command='{command}', mode='{mode}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_popen(command, mode, buffering)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_POPEN, command, mode, stack)
+        finally:
+            self._exit_hook()
         
         try:
             return self._original_popen(command, mode, buffering)
@@ -163,9 +555,14 @@ class HookedRuntime:
     
     def _hooked_socket_connect(self, self_socket, address):
         """Hook for socket.socket.connect()."""
-        stack = self._get_call_stack()
-        addr_str = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
-        self._log(f"[ALERT] NETWORK: socket.connect called with address='{addr_str}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_socket_connect(self_socket, address)
+        try:
+            stack = self._get_call_stack()
+            addr_str = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+            self._log(self._FMT_SOCKET, "connect", addr_str, stack)
+        finally:
+            self._exit_hook()
         
         try:
             return self._original_socket_connect(self_socket, address)
@@ -176,9 +573,14 @@ class HookedRuntime:
 
     def _hooked_socket_connect_ex(self, self_socket, address):
         """Hook for socket.socket.connect_ex()."""
-        stack = self._get_call_stack()
-        addr_str = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
-        self._log(f"[ALERT] NETWORK: socket.connect_ex called with address='{addr_str}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_socket_connect_ex(self_socket, address)
+        try:
+            stack = self._get_call_stack()
+            addr_str = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+            self._log(self._FMT_SOCKET, "connect_ex", addr_str, stack)
+        finally:
+            self._exit_hook()
         try:
             return self._original_socket_connect_ex(self_socket, address)
         except Exception as e:
@@ -187,10 +589,15 @@ class HookedRuntime:
 
     def _hooked_socket_create_connection(self, *args, **kwargs):
         """Hook for socket.create_connection()."""
-        stack = self._get_call_stack()
-        address = args[0] if args else kwargs.get('address')
-        addr_str = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
-        self._log(f"[ALERT] NETWORK: socket.create_connection called with address='{addr_str}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_socket_create_connection(*args, **kwargs)
+        try:
+            stack = self._get_call_stack()
+            address = args[0] if args else kwargs.get('address')
+            addr_str = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+            self._log(self._FMT_SOCKET, "create_connection", addr_str, stack)
+        finally:
+            self._exit_hook()
         try:
             return self._original_socket_create_connection(*args, **kwargs)
         except Exception as e:
@@ -199,10 +606,13 @@ class HookedRuntime:
 
     def _hooked_subprocess_call(self, *args, **kwargs) -> int:
         """Hook for subprocess.call()."""
-        stack = self._get_call_stack()
-        args_str = str(args) if args else ""
-        kwargs_str = str(kwargs) if kwargs else ""
-        self._log(f"[ALERT] SYSCALL: subprocess.call called with args={args_str}, kwargs={kwargs_str} | stack={stack}")
+        if not self._enter_hook():
+            return self._original_subprocess_call(*args, **kwargs)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_SUBPROCESS, "call", _LazyStr(args), _LazyStr(kwargs), stack)
+        finally:
+            self._exit_hook()
         
         try:
             return self._original_subprocess_call(*args, **kwargs)
@@ -212,10 +622,13 @@ class HookedRuntime:
     
     def _hooked_subprocess_run(self, *args, **kwargs) -> subprocess.CompletedProcess:
         """Hook for subprocess.run()."""
-        stack = self._get_call_stack()
-        args_str = str(args) if args else ""
-        kwargs_str = str(kwargs) if kwargs else ""
-        self._log(f"[ALERT] SYSCALL: subprocess.run called with args={args_str}, kwargs={kwargs_str} | stack={stack}")
+        if not self._enter_hook():
+            return self._original_subprocess_run(*args, **kwargs)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_SUBPROCESS, "run", _LazyStr(args), _LazyStr(kwargs), stack)
+        finally:
+            self._exit_hook()
         
         try:
             return self._original_subprocess_run(*args, **kwargs)
@@ -225,10 +638,13 @@ class HookedRuntime:
     
     def _hooked_subprocess_Popen(self, *args, **kwargs) -> subprocess.Popen:
         """Hook for subprocess.Popen()."""
-        stack = self._get_call_stack()
-        args_str = str(args) if args else ""
-        kwargs_str = str(kwargs) if kwargs else ""
-        self._log(f"[ALERT] SYSCALL: subprocess.Popen called with args={args_str}, kwargs={kwargs_str} | stack={stack}")
+        if not self._enter_hook():
+            return self._original_subprocess_Popen(*args, **kwargs)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_SUBPROCESS, "Popen", _LazyStr(args), _LazyStr(kwargs), stack)
+        finally:
+            self._exit_hook()
         
         try:
             return self._original_subprocess_Popen(*args, **kwargs)
@@ -240,7 +656,14 @@ class HookedRuntime:
         """Hook for builtin open() function."""
         file_path = str(file) if hasattr(file, '__str__') else file
         operation = self._operation_from_mode(mode)
-        self._log_file_operation(operation, file_path, mode, self._get_call_stack())
+        if (self._is_trusted_path(file_path, operation)
+                or self._is_duplicate_event(operation, file_path)
+                or not self._enter_hook()):
+            return self._original_open(file, mode, buffering, encoding, errors, newline, closefd, opener)
+        try:
+            self._log_file_operation(operation, file_path, mode, self._get_call_stack())
+        finally:
+            self._exit_hook()
         
         try:
             # Call original open
@@ -257,7 +680,15 @@ class HookedRuntime:
     def _hooked_os_open(self, path, flags, mode=0o777, *, dir_fd=None):
         """Hook for os.open()."""
         operation = self._operation_from_flags(flags)
-        self._log_file_operation(operation, str(path), str(flags), self._get_call_stack())
+        file_path = str(path)
+        if (self._is_trusted_path(file_path, operation)
+                or self._is_duplicate_event(operation, file_path)
+                or not self._enter_hook()):
+            return self._original_os_open(path, flags, mode, dir_fd=dir_fd)
+        try:
+            self._log_file_operation(operation, file_path, str(flags), self._get_call_stack())
+        finally:
+            self._exit_hook()
         
         try:
             return self._original_os_open(path, flags, mode, dir_fd=dir_fd)
@@ -267,7 +698,12 @@ class HookedRuntime:
 
     def _hooked_remove(self, path):
         """Hook for os.remove()."""
-        self._log_file_operation("delete", str(path), "", self._get_call_stack())
+        if not self._enter_hook():
+            return self._original_remove(path)
+        try:
+            self._log_file_operation("delete", str(path), "", self._get_call_stack())
+        finally:
+            self._exit_hook()
         try:
             return self._original_remove(path)
         except Exception as e:
@@ -276,7 +712,12 @@ class HookedRuntime:
 
     def _hooked_unlink(self, path):
         """Hook for os.unlink()."""
-        self._log_file_operation("delete", str(path), "", self._get_call_stack())
+        if not self._enter_hook():
+            return self._original_unlink(path)
+        try:
+            self._log_file_operation("delete", str(path), "", self._get_call_stack())
+        finally:
+            self._exit_hook()
         try:
             return self._original_unlink(path)
         except Exception as e:
@@ -285,10 +726,13 @@ class HookedRuntime:
 
     def _hooked_eval(self, source, globals=None, locals=None):
         """Hook for eval()."""
-        if isinstance(source, (str, bytes)):
-            stack = self._get_call_stack()
-            source_preview = self._format_code_source(source)
-            self._log(f"[ALERT] CODE_EXEC: eval called with source='{source_preview}' | stack={stack}")
+        if isinstance(source, (str, bytes)) and self._enter_hook():
+            try:
+                stack = self._get_call_stack()
+                source_preview = self._format_code_source(source)
+                self._log(self._FMT_CODE_EXEC, "eval", source_preview, stack)
+            finally:
+                self._exit_hook()
         try:
             return self._original_eval(source, globals, locals)
         except Exception as e:
@@ -297,23 +741,52 @@ class HookedRuntime:
 
     def _hooked_exec(self, source, globals=None, locals=None):
         """Hook for exec()."""
-        if isinstance(source, (str, bytes)):
-            stack = self._get_call_stack()
-            source_preview = self._format_code_source(source)
-            self._log(f"[ALERT] CODE_EXEC: exec called with source='{source_preview}' | stack={stack}")
+        if isinstance(source, (str, bytes)) and self._enter_hook():
+            try:
+                stack = self._get_call_stack()
+                source_preview = self._format_code_source(source)
+                self._log(self._FMT_CODE_EXEC, "exec", source_preview, stack)
+            finally:
+                self._exit_hook()
         try:
             return self._original_exec(source, globals, locals)
         except Exception as e:
             self._log(f"[ERROR] exec execution failed: {e}")
             raise
 
+    def _is_existing_file(self, filename: str) -> bool:
+        """Cached existence check for compile() filenames, using the os.stat captured at install."""
+        cache = self._compile_file_exists
+        exists = cache.get(filename)
+        if exists is not None:
+            try:
+                cache.move_to_end(filename)
+            except KeyError:
+                # Evicted concurrently by another thread
+                pass
+            return exists
+        try:
+            (self._original_stat or os.stat)(filename)
+            exists = True
+        except (OSError, ValueError):
+            exists = False
+        cache[filename] = exists
+        if len(cache) > 1024:
+            cache.popitem(last=False)
+        return exists
+
     def _hooked_compile(self, source, filename, mode, flags=0, dont_inherit=False, optimize=-1):
         """Hook for compile()."""
-        if isinstance(filename, str) and filename and os.path.exists(filename):
+        if isinstance(filename, str) and filename and self._is_existing_file(filename):
             return self._original_compile(source, filename, mode, flags, dont_inherit, optimize)
-        stack = self._get_call_stack()
-        source_preview = self._format_code_source(source)
-        self._log(f"[ALERT] CODE_EXEC: compile called with source='{source_preview}', filename='{filename}', mode='{mode}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_compile(source, filename, mode, flags, dont_inherit, optimize)
+        try:
+            stack = self._get_call_stack()
+            source_preview = self._format_code_source(source)
+            self._log(self._FMT_COMPILE, source_preview, filename, mode, stack)
+        finally:
+            self._exit_hook()
         try:
             return self._original_compile(source, filename, mode, flags, dont_inherit, optimize)
         except Exception as e:
@@ -322,8 +795,13 @@ class HookedRuntime:
 
     def _hooked_ctypes_cdll(self, name, *args, **kwargs):
         """Hook for ctypes.CDLL()."""
-        stack = self._get_call_stack()
-        self._log(f"[ALERT] MEMORY: ctypes.CDLL loaded '{name}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_ctypes_cdll(name, *args, **kwargs)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_DLL, "CDLL", name, stack)
+        finally:
+            self._exit_hook()
         try:
             return self._original_ctypes_cdll(name, *args, **kwargs)
         except Exception as e:
@@ -332,8 +810,13 @@ class HookedRuntime:
 
     def _hooked_ctypes_windll(self, name, *args, **kwargs):
         """Hook for ctypes.WinDLL()."""
-        stack = self._get_call_stack()
-        self._log(f"[ALERT] MEMORY: ctypes.WinDLL loaded '{name}' | stack={stack}")
+        if not self._enter_hook():
+            return self._original_ctypes_windll(name, *args, **kwargs)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_DLL, "WinDLL", name, stack)
+        finally:
+            self._exit_hook()
         try:
             return self._original_ctypes_windll(name, *args, **kwargs)
         except Exception as e:
@@ -342,8 +825,13 @@ class HookedRuntime:
 
     def _hooked_mmap(self, *args, **kwargs):
         """Hook for mmap.mmap()."""
-        stack = self._get_call_stack()
-        self._log(f"[ALERT] MEMORY: mmap.mmap called with args={self._truncate_value(args)}, kwargs={self._truncate_value(kwargs)} | stack={stack}")
+        if not self._enter_hook():
+            return self._original_mmap(*args, **kwargs)
+        try:
+            stack = self._get_call_stack()
+            self._log(self._FMT_MMAP, self._truncate_value(args), self._truncate_value(kwargs), stack)
+        finally:
+            self._exit_hook()
         try:
             return self._original_mmap(*args, **kwargs)
         except Exception as e:
@@ -372,6 +860,8 @@ class HookedRuntime:
         self._original_eval = builtins.eval
         self._original_exec = builtins.exec
         self._original_compile = builtins.compile
+        self._original_stat = os.stat
+        self._open_log_handle()
         
         # Replace with hooked versions
         os.system = self._hooked_system
@@ -395,7 +885,8 @@ class HookedRuntime:
             self._ctypes_module = ctypes
             self._original_ctypes_cdll = ctypes.CDLL
             ctypes.CDLL = self._hooked_ctypes_cdll
-            if hasattr(ctypes, "WinDLL"):
+            self._has_windll = hasattr(ctypes, "WinDLL")
+            if self._has_windll:
                 self._original_ctypes_windll = ctypes.WinDLL
                 ctypes.WinDLL = self._hooked_ctypes_windll
         except Exception:
@@ -451,13 +942,16 @@ class HookedRuntime:
             builtins.compile = self._original_compile
         if self._ctypes_module and self._original_ctypes_cdll:
             self._ctypes_module.CDLL = self._original_ctypes_cdll
-        if self._ctypes_module and self._original_ctypes_windll and hasattr(self._ctypes_module, "WinDLL"):
+        if self._ctypes_module and self._original_ctypes_windll and self._has_windll:
             self._ctypes_module.WinDLL = self._original_ctypes_windll
         if self._mmap_module and self._original_mmap:
             self._mmap_module.mmap = self._original_mmap
         
+        self._compile_file_exists.clear()
         self.hooks_installed = False
+        self._flush_suppressed_events(force=True)
         self._log("[INFO] Hooks uninstalled successfully")
+        self._close_log_handle()
 
 
 # Global hook runtime instance (for module-level usage)
@@ -477,6 +971,13 @@ def install_hooks(log_file: Optional[str] = None, log_queue: Optional[Any] = Non
     _hook_runtime.install_hooks()
 
 
+def flush_hook_logs():
+    """Write out coalesced-event summaries and any buffered entries at module level."""
+    if _hook_runtime:
+        _hook_runtime._flush_suppressed_events(force=True)
+        _hook_runtime._drain_log_buffer()
+
+
 def uninstall_hooks():
     """Uninstall hooks at module level."""
     global _hook_runtime
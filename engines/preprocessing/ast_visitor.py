@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+AST Visitor Base
+NodeVisitor variant that dispatches through a per-class method table instead of
+building a 'visit_<ClassName>' string and doing a getattr() for every node.
+"""
+
+import ast
+from typing import Any, Callable, Dict
+
+
+class DispatchVisitor(ast.NodeVisitor):
+    """
+    Drop-in replacement for ast.NodeVisitor.
+
+    The visit_* methods of each subclass are resolved once, when the class is
+    created, into a {node type: function} table. visit() and generic_visit()
+    then only need a dict lookup per node.
+    """
+    
+    _dispatch: Dict[type, Callable[..., Any]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        dispatch = {}
+        # ast.NodeVisitor itself is skipped: its visit_Constant only exists to
+        # forward to the deprecated visit_Num/visit_Str hooks.
+        for klass in reversed(cls.__mro__[:cls.__mro__.index(DispatchVisitor)]):
+            for name in vars(klass):
+                if not name.startswith('visit_'):
+                    continue
+                node_type = getattr(ast, name[6:], None)
+                if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                    dispatch[node_type] = getattr(cls, name)
+        cls._dispatch = dispatch
+    
+    def visit(self, node: ast.AST):
+        """Visit a node through the precomputed dispatch table."""
+        return self._dispatch.get(type(node), type(self).generic_visit)(self, node)
+    
+    def generic_visit(self, node: ast.AST):
+        """Visit all child nodes, dispatching directly without going through visit()."""
+        dispatch = self._dispatch
+        generic = type(self).generic_visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        dispatch.get(type(item), generic)(self, item)
+            elif isinstance(value, ast.AST):
+                dispatch.get(type(value), generic)(self, value)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Combined Visitor
+Runs IR generation, symbol extraction and CFG analysis in a single AST traversal.
+"""
+
+import ast
+from typing import Any, Dict, List, Tuple
+
+from engines.preprocessing.ast_visitor import DispatchVisitor
+from engines.preprocessing.ir_generator import IRGenerator
+from engines.preprocessing.symbol_table import SymbolExtractor
+from engines.static.cfg_analysis import CFGAnalyzer
+
+
+def _no_descent(node: ast.AST):
+    """generic_visit replacement for the wrapped visitors; CombinedVisitor does the walking."""
+    return None
+
+
+class CombinedVisitor(DispatchVisitor):
+    """
+    Drives IRGenerator, SymbolExtractor and CFGAnalyzer from one traversal.
+    
+    Each wrapped visitor still records its own entries through its visit_*
+    methods, but its generic_visit is disabled so that only this visitor
+    descends into the tree. Nodes are reached in the same pre-order as in a
+    standalone run, so each result list comes out identical.
+    """
+    
+    def __init__(self):
+        self.ir_generator = IRGenerator()
+        self.symbol_extractor = SymbolExtractor()
+        self.cfg_analyzer = CFGAnalyzer()
+        
+        handlers = {}
+        for part in (self.ir_generator, self.symbol_extractor, self.cfg_analyzer):
+            part.generic_visit = _no_descent
+            for node_type, func in type(part)._dispatch.items():
+                handlers.setdefault(node_type, []).append(func.__get__(part))
+        self._handlers = {node_type: tuple(funcs) for node_type, funcs in handlers.items()}
+    
+    def visit(self, node: ast.AST):
+        """Let every interested visitor record the node, then visit its children."""
+        handlers = self._handlers.get(type(node))
+        if handlers is not None:
+            for handler in handlers:
+                handler(node)
+        self.generic_visit(node)
+    
+    def generic_visit(self, node: ast.AST):
+        """Visit all child nodes."""
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+    
+    @classmethod
+    def run(cls, ast_tree: ast.AST) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Analyze an AST in a single pass.
+        
+        Args:
+            ast_tree: Root AST node
+            
+        Returns:
+            tuple: (ir, symbols, cfg_structures), matching the results of
+                ir_generator.generate, symbol_table.extract_symbols and
+                cfg_analysis.analyze respectively
+        """
+        if ast_tree is None:
+            return [], {'functions': [], 'variables': [], 'imports': [], 'classes': []}, []
+        
+        visitor = cls()
+        visitor.visit(ast_tree)
+        
+        extractor = visitor.symbol_extractor
+        symbols = {
+            'functions': extractor.functions,
+            'variables': extractor.variables,
+            'imports': extractor.imports,
+            'classes': extractor.classes
+        }
+        return visitor.ir_generator.ir, symbols, visitor.cfg_analyzer.cfg_structures
@@ -5,19 +5,20 @@ Go AST Builder
 Builds AST representation for Go source code.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from engines.preprocessing.go_parser import parse_go_file, build_go_ast
 
 
-def build_ast(file_path: str) -> Dict[str, Any]:
+def build_ast(file_path: str, source_code: Optional[str] = None) -> Dict[str, Any]:
     """
     Build AST for Go source file.
     
     Args:
         file_path: Path to Go source file
+        source_code: Already-loaded source; when given the file is not read again
         
     Returns:
         dict: AST structure
     """
-    parsed_data = parse_go_file(file_path)
+    parsed_data = parse_go_file(file_path, source_code=source_code)
     return build_go_ast(parsed_data)
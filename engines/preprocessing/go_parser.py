@@ -5,17 +5,95 @@ Go Language Parser
 Parses Go source code files and extracts basic structure.
 """
 
+import bisect
 import os
 import re
 from typing import Dict, List, Any, Optional
 
+_RE_IMPORT_QUOTED = re.compile(r'"([^"]+)"')
+# One alternation for every declaration parse_go_file extracts. Alternatives are tried
+# in priority order at each line start; [^\S\n] keeps every match on a single line, so
+# declarations inside an import block are still found.
+_RE_GO_DECL = re.compile(
+    r'^[^\S\n]*(?:'
+    r'package[^\S\n]+(?P<package>\w+)'
+    r'|import[^\S\n]+"(?P<single_import>[^"\n]+)"'
+    r'|(?P<import_open>import \()[^\S\n]*$'
+    r'|func[^\S\n]+(?P<func>\w+)[^\S\n]*\([^)\n]*\)[^\S\n]*(?:\([^)\n]*\))?[^\S\n]*(?:\w+)?[^\S\n]*\{'
+    r'|var[^\S\n]+(?P<var>\w+)[^\S\n]+'
+    r'|(?P<short_var>\w+)[^\S\n]*:='
+    r')',
+    re.M
+)
+_RE_NEWLINE = re.compile(r'\n')
+# The ')' line that closes an import block
+_RE_IMPORT_CLOSE = re.compile(r'^[^\S\n]*\)[^\S\n]*$', re.M)
+# Braces, newlines and the tokens whose contents must not count as braces
+_RE_BRACE_TOKENS = re.compile(
+    r'//[^\n]*'
+    r'|/\*.*?\*/'
+    r'|"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])*'"
+    r'|`[^`]*`'
+    r'|[{}\n]',
+    re.S
+)
 
-def parse_go_file(file_path: str) -> Dict[str, Any]:
+
+def _resolve_function_ends(source_code: str, functions: Dict[int, Dict[str, Any]]):
+    """
+    Fill in 'end_line' for each function with one scan of the source.
+    
+    Args:
+        source_code: Go source code
+        functions: Offset of each function's opening brace -> function entry
+    """
+    line_no = 1
+    stack = []
+    for match in _RE_BRACE_TOKENS.finditer(source_code):
+        token = match.group()
+        if token == '\n':
+            line_no += 1
+        elif token == '{':
+            stack.append(functions.get(match.start()))
+        elif token == '}':
+            if stack:
+                func = stack.pop()
+                if func is not None:
+                    func['end_line'] = line_no
+        else:
+            # String, rune or comment: skip its contents
+            line_no += token.count('\n')
+
+
+def _block_imports(block: str) -> List[str]:
+    """
+    Collect the quoted paths of an import block.
+    
+    Args:
+        block: Text between the 'import (' line and the closing ')' line
+        
+    Returns:
+        List[str]: One path per line that quotes one; nested 'import (' lines are skipped
+    """
+    imports = []
+    for imp_line in block.split('\n'):
+        stripped = imp_line.strip()
+        if stripped == 'import (':
+            continue
+        match = _RE_IMPORT_QUOTED.search(stripped)
+        if match:
+            imports.append(match.group(1))
+    return imports
+
+
+def parse_go_file(file_path: str, source_code: Optional[str] = None) -> Dict[str, Any]:
     """
     Parse a Go source file and extract basic structure.
     
     Args:
         file_path: Path to Go source file
+        source_code: Already-loaded source; when given the file is not read again
         
     Returns:
         dict: Parsed structure containing:
@@ -25,11 +103,12 @@ def parse_go_file(file_path: str) -> Dict[str, Any]:
             - 'variables': List[Dict] - Variable declarations
             - 'source_code': str - Original source code
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source_code = f.read()
-    except Exception as e:
-        raise IOError(f"Failed to read Go file {file_path}: {str(e)}")
+    if source_code is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                source_code = f.read()
+        except Exception as e:
+            raise IOError(f"Failed to read Go file {file_path}: {str(e)}")
     
     result = {
         'package': '',
@@ -40,83 +119,57 @@ def parse_go_file(file_path: str) -> Dict[str, Any]:
         'file_path': file_path
     }
     
-    lines = source_code.split('\n')
-    
-    # Extract package name
-    package_pattern = r'^package\s+(\w+)'
-    for line in lines:
-        match = re.match(package_pattern, line.strip())
-        if match:
-            result['package'] = match.group(1)
-            break
-    
-    # Extract imports
-    in_import_block = False
-    import_block = []
-    for i, line in enumerate(lines):
-        stripped = line.strip()
+    # Single scan over the whole source; line numbers come from the newline offsets
+    newlines = [m.start() for m in _RE_NEWLINE.finditer(source_code)]
+    func_braces = {}
+    # End offset of the current import block, and its paths once it has closed;
+    # they are added when the scan passes the ')' line, after any single imports inside
+    block_end = -1
+    pending_imports: List[str] = []
+    for match in _RE_GO_DECL.finditer(source_code):
+        kind = match.lastgroup
+        line_no = bisect.bisect_left(newlines, match.start()) + 1
+        if pending_imports and match.start() > block_end:
+            result['imports'].extend(pending_imports)
+            pending_imports = []
         
-        # Single line import
-        if re.match(r'^import\s+"[^"]+"', stripped):
-            match = re.search(r'"([^"]+)"', stripped)
-            if match:
-                result['imports'].append(match.group(1))
-        
-        # Multi-line import block
-        if stripped == 'import (':
-            in_import_block = True
-            continue
-        elif in_import_block:
-            if stripped == ')':
-                in_import_block = False
-                # Parse collected import block
-                for imp_line in import_block:
-                    match = re.search(r'"([^"]+)"', imp_line)
-                    if match:
-                        result['imports'].append(match.group(1))
-                import_block = []
-            else:
-                import_block.append(stripped)
-    
-    # Extract function definitions
-    func_pattern = r'^func\s+(\w+)\s*\([^)]*\)\s*(?:\([^)]*\))?\s*(?:\w+)?\s*\{'
-    for i, line in enumerate(lines):
-        match = re.match(func_pattern, line.strip())
-        if match:
-            func_name = match.group(1)
-            # Find function end (simplified - looks for matching braces)
-            start_line = i + 1
-            brace_count = 1
-            end_line = start_line
-            
-            for j in range(i + 1, len(lines)):
-                brace_count += lines[j].count('{') - lines[j].count('}')
-                if brace_count == 0:
-                    end_line = j + 1
-                    break
-            
-            result['functions'].append({
-                'name': func_name,
-                'start_line': start_line,
-                'end_line': end_line,
-                'line': i + 1
+        if kind == 'package':
+            # First declaration wins
+            if not result['package']:
+                result['package'] = match.group('package')
+        elif kind == 'single_import':
+            result['imports'].append(match.group('single_import'))
+        elif kind == 'import_open':
+            if match.start() < block_end:
+                # 'import (' inside an open block does not start a new one
+                continue
+            close = _RE_IMPORT_CLOSE.search(source_code, match.end())
+            if close is None:
+                # Unterminated block: its paths are dropped, later declarations still count
+                block_end = len(source_code)
+                continue
+            block_end = close.start()
+            pending_imports = _block_imports(source_code[match.end():block_end])
+        elif kind == 'func':
+            func = {
+                'name': match.group('func'),
+                'start_line': line_no,
+                'end_line': line_no,
+                'line': line_no
+            }
+            result['functions'].append(func)
+            # The pattern ends at the opening brace; end_line is resolved after the scan
+            func_braces[match.end() - 1] = func
+        else:
+            result['variables'].append({
+                'name': match.group(kind),
+                'line': line_no
             })
     
-    # Extract variable declarations
-    var_patterns = [
-        r'^var\s+(\w+)\s+',
-        r'^(\w+)\s*:=\s*',
-    ]
-    for i, line in enumerate(lines):
-        for pattern in var_patterns:
-            match = re.match(pattern, line.strip())
-            if match:
-                var_name = match.group(1)
-                result['variables'].append({
-                    'name': var_name,
-                    'line': i + 1
-                })
-                break
+    result['imports'].extend(pending_imports)
+    
+    if func_braces:
+        _resolve_function_ends(source_code, func_braces)
     
     return result
 
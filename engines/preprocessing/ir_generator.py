@@ -6,32 +6,65 @@ Converts AST to simplified linear intermediate representation (List of Dicts).
 """
 
 import ast
+import sys
 from typing import List, Dict, Any, Optional
 
+from engines.preprocessing.ast_visitor import DispatchVisitor
 
-class IRGenerator(ast.NodeVisitor):
+# Operator symbols for displaying binary operations
+_BINOP_SYMBOLS = {
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.MatMult: '@',
+    ast.Div: '/',
+    ast.FloorDiv: '//',
+    ast.Mod: '%',
+    ast.Pow: '**',
+    ast.LShift: '<<',
+    ast.RShift: '>>',
+    ast.BitOr: '|',
+    ast.BitXor: '^',
+    ast.BitAnd: '&'
+}
+
+
+class IRGenerator(DispatchVisitor):
     """AST visitor to generate intermediate representation."""
     
     def __init__(self):
         self.ir = []  # List of IR dictionaries
+        self._name_cache = {}  # id(node) -> interned display name
     
     def _get_node_name(self, node: ast.AST) -> str:
         """Get a string representation of a node for display."""
         if isinstance(node, ast.Name):
+            # Identifiers are already interned by the parser
             return node.id
-        elif isinstance(node, ast.Attribute):
+        name = self._name_cache.get(id(node))
+        if name is None:
+            name = sys.intern(self._format_node_name(node))
+            self._name_cache[id(node)] = name
+        return name
+    
+    def _format_node_name(self, node: ast.AST) -> str:
+        """Build the display name of a node; see _get_node_name."""
+        if isinstance(node, ast.Attribute):
             return f"{self._get_node_name(node.value)}.{node.attr}"
         elif isinstance(node, ast.Constant):
             return repr(node.value)
-        elif isinstance(node, ast.Str):  # Python < 3.8
-            return repr(node.s)
-        elif isinstance(node, ast.Num):  # Python < 3.8
-            return repr(node.n)
         elif isinstance(node, ast.Call):
             func_name = self._get_node_name(node.func)
             return f"{func_name}(...)"
+        elif isinstance(node, ast.BinOp):
+            left = self._get_node_name(node.left)
+            right = self._get_node_name(node.right)
+            return f"{left} {_BINOP_SYMBOLS.get(type(node.op), '?')} {right}"
+        elif isinstance(node, ast.Subscript):
+            return f"{self._get_node_name(node.value)}[...]"
         else:
-            return ast.dump(node)
+            # Placeholder; dumping the whole subtree costs O(subtree) for a display string
+            return f"<{type(node).__name__}>"
     
     def _get_call_args(self, node: ast.Call) -> List[str]:
         """Extract argument representations from a Call node."""
@@ -168,12 +201,8 @@ class IRGenerator(ast.NodeVisitor):
         self.generic_visit(node)
     
     def _get_body_lines(self, body: List[ast.AST]) -> List[int]:
-        """Extract line numbers from a body of statements."""
-        lines = []
-        for stmt in body:
-            if hasattr(stmt, 'lineno'):
-                lines.append(stmt.lineno)
-        return lines
+        """Extract line numbers from a body of statements (every statement has a lineno)."""
+        return [stmt.lineno for stmt in body]
     
     def visit_FunctionDef(self, node: ast.FunctionDef):
         """Extract function definitions."""
@@ -5,19 +5,20 @@ Java AST Builder
 Builds AST representation for Java source code.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from engines.preprocessing.java_parser import parse_java_file, build_java_ast
 
 
-def build_ast(file_path: str) -> Dict[str, Any]:
+def build_ast(file_path: str, source_code: Optional[str] = None) -> Dict[str, Any]:
     """
     Build AST for Java source file.
     
     Args:
         file_path: Path to Java source file
+        source_code: Already-loaded source; when given the file is not read again
         
     Returns:
         dict: AST structure
     """
-    parsed_data = parse_java_file(file_path)
+    parsed_data = parse_java_file(file_path, source_code=source_code)
     return build_java_ast(parsed_data)
@@ -5,122 +5,241 @@ Java Language Parser
 Parses Java source code files and extracts basic structure.
 """
 
+import bisect
 import os
 import re
 from typing import Dict, List, Any, Optional
 
+# Optional: tree-sitter Java grammar. When installed, declarations come from a real
+# parse tree, which also sees multi-line signatures and ignores comments and strings.
+_TS_QUERY_SOURCE = """
+(package_declaration [(scoped_identifier) (identifier)] @package)
+(import_declaration) @import
+(class_declaration) @class
+(method_declaration name: (identifier) @method)
+(field_declaration declarator: (variable_declarator name: (identifier) @variable))
+(local_variable_declaration declarator: (variable_declarator name: (identifier) @variable))
+"""
+try:
+    import tree_sitter
+    import tree_sitter_java
+    _TS_LANGUAGE = tree_sitter.Language(tree_sitter_java.language())
+    _TS_PARSER = tree_sitter.Parser(_TS_LANGUAGE)
+    _TS_QUERY = tree_sitter.Query(_TS_LANGUAGE, _TS_QUERY_SOURCE)
+except Exception:
+    _TS_PARSER = None
+    _TS_QUERY = None
+
+# Declaration patterns, run with finditer over the whole source. Each one starts at a
+# line start and skips the indentation; [^\S\n] keeps every match on a single line.
+_RE_PACKAGE = re.compile(r'^[^\S\n]*package[^\S\n]+([\w.]+);', re.M)
+_RE_IMPORT = re.compile(r'^[^\S\n]*import[^\S\n]+(?:static[^\S\n]+)?([\w.*]+);', re.M)
+_RE_CLASS = re.compile(
+    r'^[^\S\n]*(?:public[^\S\n]+|private[^\S\n]+|protected[^\S\n]+)?'
+    r'(?:abstract[^\S\n]+|final[^\S\n]+)?class[^\S\n]+(\w+)',
+    re.M
+)
+# Lines that start with 'class' are never methods
+_RE_METHOD = re.compile(
+    r'^(?![^\S\n]*class[^\S\n])(?:public|private|protected|static|[^\S\n])*'
+    r'(?:[\w<>\[\]]+[^\S\n]+)?(\w+)[^\S\n]*\([^)\n]*\)[^\S\n]*'
+    r'(?:throws[^\S\n]+(?:[\w,]|[^\S\n])+)?[^\S\n]*\{',
+    re.M
+)
+_RE_VARIABLE = re.compile(
+    r'^(?:public|private|protected|static|[^\S\n])*([\w<>\[\]]+)[^\S\n]+(\w+)[^\S\n]*[=;]',
+    re.M
+)
+_RE_NEWLINE = re.compile(r'\n')
+_RE_BRACE_OR_NEWLINE = re.compile(r'[{}\n]')
+# Comments and string/char literals, scanned left to right in one pass so a
+# comment marker inside a literal (or a quote inside a comment) is not misread
+_RE_COMMENT_OR_LITERAL = re.compile(
+    r'//[^\n]*'
+    r'|/\*.*?(?:\*/|\Z)'
+    r'|"""(?:\\.|.)*?(?:"""|\Z)'
+    r'|"(?:\\.|[^"\\\n])*"?'
+    r"|'(?:\\.|[^'\\\n])*'?",
+    re.S
+)
+
 
-def parse_java_file(file_path: str) -> Dict[str, Any]:
+def _find_class_end(source_code: str, pos: int, start_line: int) -> int:
     """
-    Parse a Java source file and extract basic structure.
+    Find the end line of a class by brace counting (simplified).
     
-    Args:
-        file_path: Path to Java source file
-        
-    Returns:
-        dict: Parsed structure containing:
-            - 'package': str - Package name
-            - 'imports': List[str] - Import statements
-            - 'classes': List[Dict] - Class definitions
-            - 'methods': List[Dict] - Method definitions
-            - 'variables': List[Dict] - Variable declarations
-            - 'source_code': str - Original source code
+    Counting starts at pos, the start of the declaration line. The count is only
+    checked at the end of each following line, so a class whose braces balance on
+    its own line extends to the next balanced line.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source_code = f.read()
-    except Exception as e:
-        raise IOError(f"Failed to read Java file {file_path}: {str(e)}")
-    
-    result = {
+    brace_count = 0
+    line_no = start_line
+    for match in _RE_BRACE_OR_NEWLINE.finditer(source_code, pos):
+        char = match.group()
+        if char == '{':
+            brace_count += 1
+        elif char == '}':
+            brace_count -= 1
+        else:
+            if line_no > start_line and brace_count == 0:
+                return line_no
+            line_no += 1
+    if line_no > start_line and brace_count == 0:
+        return line_no
+    return start_line
+
+
+def _node_text(node) -> str:
+    return node.text.decode('utf-8', errors='replace')
+
+
+def _new_declarations() -> Dict[str, Any]:
+    return {
         'package': '',
         'imports': [],
         'classes': [],
         'methods': [],
-        'variables': [],
-        'source_code': source_code,
-        'file_path': file_path
+        'variables': []
     }
+
+
+def _ts_captures(node) -> Dict[str, list]:
+    """Run the declaration query; tree-sitter 0.25 moved captures() to QueryCursor."""
+    if hasattr(tree_sitter, 'QueryCursor'):
+        return tree_sitter.QueryCursor(_TS_QUERY).captures(node)
+    return _TS_QUERY.captures(node)
+
+
+def _extract_with_tree_sitter(source_code: str) -> Dict[str, Any]:
+    """Extract declarations from a tree-sitter parse tree."""
+    result = _new_declarations()
+    tree = _TS_PARSER.parse(source_code.encode('utf-8'))
+    captures = _ts_captures(tree.root_node)
+    
+    def in_order(name):
+        return sorted(captures.get(name, []), key=lambda n: n.start_byte)
+    
+    packages = in_order('package')
+    if packages:
+        result['package'] = _node_text(packages[0])
+    
+    for node in in_order('import'):
+        path = ''
+        for child in node.named_children:
+            if child.type in ('scoped_identifier', 'identifier'):
+                path = _node_text(child)
+            elif child.type == 'asterisk':
+                path += '.*'
+        if path:
+            result['imports'].append(path)
+    
+    for node in in_order('class'):
+        name = node.child_by_field_name('name')
+        if name is not None:
+            result['classes'].append({
+                'name': _node_text(name),
+                'start_line': name.start_point[0] + 1,
+                'end_line': node.end_point[0] + 1,
+                'line': name.start_point[0] + 1
+            })
+    
+    # Constructors are constructor_declaration nodes, so there is nothing to filter
+    for kind, key in (('method', 'methods'), ('variable', 'variables')):
+        for node in in_order(kind):
+            result[key].append({
+                'name': _node_text(node),
+                'line': node.start_point[0] + 1
+            })
+    
+    return result
+
+
+def _extract_with_regex(source_code: str) -> Dict[str, Any]:
+    """Extract declarations with the line-based patterns."""
+    result = _new_declarations()
     
-    lines = source_code.split('\n')
+    # One finditer per pattern over the whole source; line numbers come from the
+    # newline offsets. A pattern is only run when the source contains its keyword,
+    # which is a plain substring search and far cheaper than the regex scan.
+    newlines = [m.start() for m in _RE_NEWLINE.finditer(source_code)]
     
-    # Extract package name
-    package_pattern = r'^package\s+([\w.]+);'
-    for line in lines:
-        match = re.match(package_pattern, line.strip())
-        if match:
-            result['package'] = match.group(1)
-            break
+    # Extract package name (first one wins)
+    match = _RE_PACKAGE.search(source_code) if 'package' in source_code else None
+    if match:
+        result['package'] = match.group(1)
     
     # Extract imports
-    import_pattern = r'^import\s+(?:static\s+)?([\w.*]+);'
-    for line in lines:
-        match = re.match(import_pattern, line.strip())
-        if match:
-            result['imports'].append(match.group(1))
+    if 'import' in source_code:
+        result['imports'].extend(m.group(1) for m in _RE_IMPORT.finditer(source_code))
     
     # Extract class definitions
-    class_pattern = r'^(?:public\s+|private\s+|protected\s+)?(?:abstract\s+|final\s+)?class\s+(\w+)'
-    for i, line in enumerate(lines):
-        match = re.search(class_pattern, line.strip())
-        if match:
-            class_name = match.group(1)
-            # Find class end (simplified)
-            start_line = i + 1
-            brace_count = line.count('{') - line.count('}')
-            end_line = start_line
-            
-            for j in range(i + 1, len(lines)):
-                brace_count += lines[j].count('{') - lines[j].count('}')
-                if brace_count == 0:
-                    end_line = j + 1
-                    break
-            
-            result['classes'].append({
-                'name': class_name,
-                'start_line': start_line,
-                'end_line': end_line,
-                'line': i + 1
+    class_matches = _RE_CLASS.finditer(source_code) if 'class' in source_code else ()
+    for match in class_matches:
+        line_no = bisect.bisect_left(newlines, match.start()) + 1
+        result['classes'].append({
+            'name': match.group(1),
+            'start_line': line_no,
+            'end_line': _find_class_end(source_code, match.start(), line_no),
+            'line': line_no
+        })
+    
+    # Extract method definitions (a declaration needs both a parameter list and a body)
+    method_matches = _RE_METHOD.finditer(source_code) if '(' in source_code and '{' in source_code else ()
+    class_names = frozenset(cls['name'] for cls in result['classes'])
+    for match in method_matches:
+        method_name = match.group(1)
+        # Skip constructors (same name as class)
+        if method_name not in class_names:
+            result['methods'].append({
+                'name': method_name,
+                'line': bisect.bisect_left(newlines, match.start()) + 1
             })
     
-    # Extract method definitions
-    method_pattern = r'^(?:public|private|protected|static|\s)*\s*(?:[\w<>\[\]]+\s+)?(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w\s,]+)?\s*\{'
-    for i, line in enumerate(lines):
-        # Skip if it's a class declaration
-        if re.search(r'^\s*class\s+', line):
-            continue
+    # Extract variable declarations
+    for match in _RE_VARIABLE.finditer(source_code):
+        result['variables'].append({
+            'name': match.group(2),
+            'line': bisect.bisect_left(newlines, match.start()) + 1
+        })
+    
+    return result
+
+
+def parse_java_file(file_path: str, source_code: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse a Java source file and extract basic structure.
+    
+    Args:
+        file_path: Path to Java source file
+        source_code: Already-loaded source; when given the file is not read again
         
-        match = re.search(method_pattern, line.strip())
-        if match:
-            method_name = match.group(1)
-            # Skip constructors (same name as class)
-            is_constructor = False
-            for cls in result['classes']:
-                if method_name == cls['name']:
-                    is_constructor = True
-                    break
-            
-            if not is_constructor:
-                result['methods'].append({
-                    'name': method_name,
-                    'line': i + 1
-                })
+    Returns:
+        dict: Parsed structure containing:
+            - 'package': str - Package name
+            - 'imports': List[str] - Import statements
+            - 'classes': List[Dict] - Class definitions
+            - 'methods': List[Dict] - Method definitions
+            - 'variables': List[Dict] - Variable declarations
+            - 'source_code': str - Original source code
+    """
+    if source_code is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                source_code = f.read()
+        except Exception as e:
+            raise IOError(f"Failed to read Java file {file_path}: {str(e)}")
     
-    # Extract variable declarations
-    var_patterns = [
-        r'^(?:public|private|protected|static|\s)*\s*([\w<>\[\]]+)\s+(\w+)\s*[=;]',
-    ]
-    for i, line in enumerate(lines):
-        for pattern in var_patterns:
-            match = re.match(pattern, line.strip())
-            if match:
-                var_name = match.group(2) if len(match.groups()) > 1 else match.group(1)
-                result['variables'].append({
-                    'name': var_name,
-                    'line': i + 1
-                })
-                break
+    result = None
+    if _TS_PARSER is not None:
+        try:
+            result = _extract_with_tree_sitter(source_code)
+        except Exception:
+            result = None
+    if result is None:
+        result = _extract_with_regex(source_code)
     
+    result['source_code'] = source_code
+    result['file_path'] = file_path
     return result
 
 
@@ -143,3 +262,29 @@ def build_java_ast(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         'variables': parsed_data.get('variables', []),
         'source_code': parsed_data.get('source_code', '')
     }
+
+
+def _blank_comment(match: re.Match) -> str:
+    text = match.group(0)
+    if text[0] != '/':
+        return text
+    # Keep the newlines of block comments so line numbers stay put
+    return '\n' * text.count('\n')
+
+
+def strip_comments(source_code: str) -> str:
+    """
+    Remove // and /* */ comments from Java source.
+    
+    String, text-block and char literals are kept intact, and every newline is
+    preserved so line numbers in the result match the original source.
+    
+    Args:
+        source_code: Java source code
+        
+    Returns:
+        str: Source code without comments
+    """
+    if '/' not in source_code:
+        return source_code
+    return _RE_COMMENT_OR_LITERAL.sub(_blank_comment, source_code)
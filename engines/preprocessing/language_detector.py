@@ -8,6 +8,41 @@ Detects programming language from file extension and content.
 import os
 from typing import Optional
 
+# Extension -> language mapping
+_LANGUAGE_MAP = {
+    '.py': 'python',
+    '.go': 'go',
+    '.java': 'java',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.cpp': 'cpp',
+    '.c': 'c',
+    '.cs': 'csharp',
+    '.rb': 'ruby',
+    '.php': 'php'
+}
+
+# Languages with a full analysis pipeline
+_SUPPORTED_LANGUAGES = frozenset(('python', 'go', 'java'))
+
+_DISPLAY_NAMES = {
+    'python': 'Python',
+    'go': 'Go',
+    'java': 'Java',
+    'javascript': 'JavaScript',
+    'typescript': 'TypeScript',
+    'cpp': 'C++',
+    'c': 'C',
+    'csharp': 'C#',
+    'ruby': 'Ruby',
+    'php': 'PHP',
+    'unknown': 'Unknown'
+}
+
+# Bytes read for the content sniff; enough for the first few lines of a source file
+_SNIFF_BYTES = 4096
+_SNIFF_LINES = 5
+
 
 def detect_language(file_path: str) -> str:
     """
@@ -22,42 +57,28 @@ def detect_language(file_path: str) -> str:
     if not file_path:
         return 'unknown'
     
-    # Get file extension
-    _, ext = os.path.splitext(file_path.lower())
-    
-    # Language mapping
-    language_map = {
-        '.py': 'python',
-        '.go': 'go',
-        '.java': 'java',
-        '.js': 'javascript',
-        '.ts': 'typescript',
-        '.cpp': 'cpp',
-        '.c': 'c',
-        '.cs': 'csharp',
-        '.rb': 'ruby',
-        '.php': 'php'
-    }
-    
-    # Check extension first
-    if ext in language_map:
-        return language_map[ext]
+    # Check extension first; known extensions never touch the filesystem
+    language = _LANGUAGE_MAP.get(os.path.splitext(file_path)[1].lower())
+    if language is not None:
+        return language
     
     # Fallback: try to detect from file content (for files without extension)
+    # One read of raw bytes; the markers are ASCII so nothing needs decoding
     try:
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                first_lines = ''.join([f.readline() for _ in range(5)])
-                
-            # Check for language-specific patterns
-            if 'package main' in first_lines or 'import (' in first_lines:
-                return 'go'
-            elif 'package ' in first_lines and 'import ' in first_lines:
-                return 'java'
-            elif '#!/usr/bin/env python' in first_lines or 'def ' in first_lines:
-                return 'python'
+        with open(file_path, 'rb') as f:
+            head = f.read(_SNIFF_BYTES)
     except Exception:
-        pass
+        return 'unknown'
+    
+    first_lines = b'\n'.join(head.split(b'\n', _SNIFF_LINES)[:_SNIFF_LINES])
+    
+    # Check for language-specific patterns
+    if b'package main' in first_lines or b'import (' in first_lines:
+        return 'go'
+    elif b'package ' in first_lines and b'import ' in first_lines:
+        return 'java'
+    elif b'#!/usr/bin/env python' in first_lines or b'def ' in first_lines:
+        return 'python'
     
     return 'unknown'
 
@@ -72,8 +93,7 @@ def is_supported_language(language: str) -> bool:
     Returns:
         bool: True if language is supported
     """
-    supported = {'python', 'go', 'java'}
-    return language in supported
+    return language in _SUPPORTED_LANGUAGES
 
 
 def get_language_display_name(language: str) -> str:
@@ -86,17 +106,4 @@ def get_language_display_name(language: str) -> str:
     Returns:
         str: Display name
     """
-    display_names = {
-        'python': 'Python',
-        'go': 'Go',
-        'java': 'Java',
-        'javascript': 'JavaScript',
-        'typescript': 'TypeScript',
-        'cpp': 'C++',
-        'c': 'C',
-        'csharp': 'C#',
-        'ruby': 'Ruby',
-        'php': 'PHP',
-        'unknown': 'Unknown'
-    }
-    return display_names.get(language, language.capitalize())
+    return _DISPLAY_NAMES.get(language, language.capitalize())
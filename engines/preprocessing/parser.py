@@ -21,7 +21,6 @@ def read_file(file_path: str) -> str:
     Raises:
         FileNotFoundError: If file does not exist
         PermissionError: If file cannot be read
-        UnicodeDecodeError: If file encoding is invalid
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
@@ -30,25 +29,22 @@ def read_file(file_path: str) -> str:
         raise ValueError(f"Path is not a file: {file_path}")
     
     try:
-        # Try UTF-8 encoding first
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return content
-    except UnicodeDecodeError:
-        # Fallback to latin-1 if UTF-8 fails
-        try:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-            return content
-        except Exception as e:
-            raise UnicodeDecodeError(
-                'utf-8',
-                b'',
-                0,
-                1,
-                f"Could not decode file {file_path}: {str(e)}"
-            )
+        # Read the bytes once and decode in memory
+        with open(file_path, 'rb') as f:
+            data = f.read()
     except PermissionError:
         raise PermissionError(f"Permission denied: {file_path}")
     except Exception as e:
         raise IOError(f"Error reading file {file_path}: {str(e)}")
+    
+    try:
+        # Try UTF-8 first; utf-8-sig drops a leading BOM, which ast.parse rejects
+        content = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        # Fallback to latin-1 if UTF-8 fails (latin-1 decodes any byte sequence)
+        content = data.decode('latin-1')
+    
+    # Same newline handling as reading in text mode
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
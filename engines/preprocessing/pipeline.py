@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Preprocessing Pipeline
+Runs the per-file preprocessing steps (read, parse, symbols, IR, CFG) for many
+files, spreading the work across processes.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from engines.analysis.cache_manager import load_cache, save_cache
+from engines.preprocessing.parser import read_file
+from engines.preprocessing import java_parser
+from engines.preprocessing.ast_builder import build_ast
+from engines.preprocessing.combined_visitor import CombinedVisitor
+from engines.preprocessing.go_ast_builder import build_ast as build_go_ast
+from engines.preprocessing.java_ast_builder import build_ast as build_java_ast
+from engines.preprocessing.language_detector import detect_language
+
+# Part of every cache key; bump whenever the preprocessing output changes shape
+_CACHE_VERSION = '1'
+
+
+def _cache_key(file_path: str, language: str) -> str:
+    """Key a file's cache entry on its content, so unchanged files hit across runs and checkouts."""
+    hasher = hashlib.sha1()
+    hasher.update(f"{_CACHE_VERSION}:{language}:".encode('utf-8'))
+    if language == 'java':
+        # tree-sitter and the regex fallback report different Java symbols
+        backend = 'ts' if java_parser._TS_PARSER is not None else 're'
+        hasher.update(f"{backend}:".encode('utf-8'))
+    with open(file_path, 'rb') as f:
+        hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def preprocess_file(file_path: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Preprocess a single source file.
+    
+    Args:
+        file_path: Path to source file
+        cache_dir: Optional directory for results keyed by file content. A file
+            whose content was already preprocessed is not parsed again.
+        
+    Returns:
+        dict: Plain (picklable) result containing:
+            - 'file_path': str
+            - 'language': str
+            - 'success': bool
+            - 'error': str or None
+            - 'symbols': Symbols, in the same shape analyze_file reports them
+            - 'ir': List[Dict] - IR records (Python only)
+            - 'cfg_structures': List[Dict] - CFG structures (Python only)
+    """
+    language = detect_language(file_path)
+    
+    cache_key = None
+    if cache_dir:
+        try:
+            cache_key = _cache_key(file_path, language)
+        except OSError:
+            cache_key = None
+        cached = load_cache(cache_dir, cache_key, 0) if cache_key else None
+        if cached is not None:
+            cached['file_path'] = file_path
+            return cached
+    
+    result = {
+        'file_path': file_path,
+        'language': language,
+        'success': True,
+        'error': None,
+        'symbols': {},
+        'ir': [],
+        'cfg_structures': []
+    }
+    
+    try:
+        if language == 'python':
+            ast_tree = build_ast(read_file(file_path), filename=file_path)
+            result['ir'], result['symbols'], result['cfg_structures'] = CombinedVisitor.run(ast_tree)
+        elif language == 'go':
+            ast_tree = build_go_ast(file_path)
+            result['symbols'] = ast_tree.get('functions', []) + ast_tree.get('variables', [])
+        elif language == 'java':
+            ast_tree = build_java_ast(file_path)
+            result['symbols'] = ast_tree.get('classes', []) + ast_tree.get('methods', []) + ast_tree.get('variables', [])
+        else:
+            raise ValueError(f"Unsupported language: {language}")
+    except Exception as e:
+        result['success'] = False
+        result['error'] = str(e)
+    
+    if cache_key and result['success']:
+        save_cache(cache_dir, cache_key, result)
+    return result
+
+
+def preprocess_files(
+    file_paths: List[str],
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Preprocess many files in parallel.
+    
+    Parsing and AST traversal are CPU-bound pure Python, so files are spread over
+    a process pool rather than threads. Small batches run in-process, where
+    starting workers would cost more than it saves.
+    
+    Args:
+        file_paths: Paths to source files
+        max_workers: Worker processes (default: CPU count)
+        cache_dir: Optional content-keyed result cache, see preprocess_file()
+        
+    Returns:
+        List[Dict]: One preprocess_file() result per path, in input order
+    """
+    task = partial(preprocess_file, cache_dir=cache_dir)
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(file_paths) <= 1:
+        return [task(path) for path in file_paths]
+    
+    workers = min(workers, len(file_paths))
+    # Several files per task amortize the pickling round trip
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(task, file_paths, chunksize=chunksize))
@@ -8,16 +8,33 @@ Traverses AST to extract all symbols: functions, variables, imports, classes.
 import ast
 from typing import Dict, List, Any
 
+from engines.preprocessing.ast_visitor import DispatchVisitor
 
-class SymbolExtractor(ast.NodeVisitor):
+
+class SymbolExtractor(DispatchVisitor):
     """AST visitor to extract symbols from code."""
     
+    # Every symbol we record comes from a statement, and statements only ever
+    # appear in these block fields (listed in _fields order), so expressions,
+    # argument lists, aliases and patterns are never worth descending into.
+    _BLOCK_FIELDS = ('body', 'handlers', 'orelse', 'finalbody', 'cases')
+    
     def __init__(self):
         self.functions = []  # List of (name, line_no)
         self.variables = []  # List of (name, line_no)
         self.imports = []  # List of (module_name, line_no, alias)
         self.classes = []  # List of (name, line_no)
     
+    def generic_visit(self, node: ast.AST):
+        """Visit the statements nested in a node's blocks."""
+        dispatch = self._dispatch
+        generic = SymbolExtractor.generic_visit
+        for field in self._BLOCK_FIELDS:
+            block = getattr(node, field, None)
+            if type(block) is list:
+                for child in block:
+                    dispatch.get(type(child), generic)(self, child)
+    
     def visit_FunctionDef(self, node: ast.FunctionDef):
         """Extract function definitions."""
         self.functions.append({
@@ -6,20 +6,33 @@ Identifies control flow structures (if, for, while, try) and records line number
 """
 
 import ast
+import sys
 from typing import List, Dict, Any
 
+from engines.preprocessing.ast_visitor import DispatchVisitor
 
-class CFGAnalyzer(ast.NodeVisitor):
+
+class CFGAnalyzer(DispatchVisitor):
     """AST visitor for control flow analysis."""
     
     def __init__(self):
         self.cfg_structures = []
+        self._repr_cache = {}  # id(node) -> interned representation
     
     def _get_node_repr(self, node: ast.AST) -> str:
         """Get simplified string representation of a node."""
         if isinstance(node, ast.Name):
+            # Identifiers are already interned by the parser
             return node.id
-        elif isinstance(node, ast.Attribute):
+        text = self._repr_cache.get(id(node))
+        if text is None:
+            text = sys.intern(self._format_node_repr(node))
+            self._repr_cache[id(node)] = text
+        return text
+    
+    def _format_node_repr(self, node: ast.AST) -> str:
+        """Build the simplified representation of a node; see _get_node_repr."""
+        if isinstance(node, ast.Attribute):
             if isinstance(node.value, ast.Name):
                 return f"{node.value.id}.{node.attr}"
         elif isinstance(node, ast.Compare):
@@ -37,54 +50,22 @@ class CFGAnalyzer(ast.NodeVisitor):
                     return f"{node.func.value.id}.{node.func.attr}(...)"
         elif isinstance(node, ast.Constant):
             return repr(node.value)
-        elif isinstance(node, ast.Str):  # Python < 3.8
-            return repr(node.s)
-        elif isinstance(node, ast.Num):  # Python < 3.8
-            return repr(node.n)
         
-        return ast.dump(node)[:50]  # Limit length
+        # Placeholder; dumping the whole subtree costs O(subtree) for a display string
+        return f"<{type(node).__name__}>"
     
     def _get_body_lines(self, body: List[ast.AST]) -> List[int]:
-        """Extract all line numbers from a body of statements."""
-        lines = []
-        for stmt in body:
-            if hasattr(stmt, 'lineno'):
-                lines.append(stmt.lineno)
-            # Recursively get lines from nested structures
-            if isinstance(stmt, (ast.If, ast.For, ast.While, ast.Try)):
-                lines.extend(self._get_body_lines(stmt.body))
-                if isinstance(stmt, ast.If) and stmt.orelse:
-                    lines.extend(self._get_body_lines(stmt.orelse))
-                elif isinstance(stmt, (ast.For, ast.While)) and stmt.orelse:
-                    lines.extend(self._get_body_lines(stmt.orelse))
-                elif isinstance(stmt, ast.Try):
-                    for handler in stmt.handlers:
-                        lines.extend(self._get_body_lines(handler.body))
-                    if stmt.orelse:
-                        lines.extend(self._get_body_lines(stmt.orelse))
-                    if stmt.finalbody:
-                        lines.extend(self._get_body_lines(stmt.finalbody))
-        return sorted(set(lines))  # Remove duplicates and sort
+        """
+        Extract the line numbers of the statements directly in a body.
+        
+        Nested control flow structures are visited on their own and report
+        their own lines; use start_line..end_line for the full extent of a block.
+        """
+        return [stmt.lineno for stmt in body]
     
     def _get_end_line(self, node: ast.AST) -> int:
-        """Estimate end line of a node by finding the maximum line in its body."""
-        max_line = node.lineno
-        if hasattr(node, 'body'):
-            for stmt in node.body:
-                if hasattr(stmt, 'lineno'):
-                    max_line = max(max_line, stmt.lineno)
-                # Recursively check nested structures
-                if isinstance(stmt, (ast.If, ast.For, ast.While, ast.Try)):
-                    max_line = max(max_line, self._get_end_line(stmt))
-        if hasattr(node, 'orelse') and node.orelse:
-            for stmt in node.orelse:
-                if hasattr(stmt, 'lineno'):
-                    max_line = max(max_line, stmt.lineno)
-        if hasattr(node, 'finalbody') and node.finalbody:
-            for stmt in node.finalbody:
-                if hasattr(stmt, 'lineno'):
-                    max_line = max(max_line, stmt.lineno)
-        return max_line
+        """Get the end line of a node (end_lineno is set by the parser on Python 3.8+)."""
+        return getattr(node, 'end_lineno', None) or node.lineno
     
     def visit_If(self, node: ast.If):
         """Extract if statement structure."""
@@ -173,7 +154,7 @@ def analyze(ast_tree: ast.AST) -> List[Dict[str, Any]]:
             - 'type': str - Type of structure ('if', 'for', 'while', 'try')
             - 'start_line': int - Starting line number
             - 'end_line': int - Ending line number
-            - 'body_lines': List[int] - Line numbers in the body
+            - 'body_lines': List[int] - Line numbers of the statements directly in the body
             - Additional fields depending on structure type
     """
     if ast_tree is None:
@@ -6,17 +6,217 @@ CVE 匹配器（增强版）
 """
 
 import os
+import re
 import json
+import asyncio
+import threading
+import concurrent.futures
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Any, Optional
 
+from engines.analysis.cache_manager import load_cache, save_cache, prune_cache
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# 只报告这些严重程度的漏洞
+REPORTED_SEVERITIES = ('high', 'critical')
+
 # 官方 OSV API 端点
 OSV_QUERY_BATCH_URL = "https://api.osv.dev/v1/querybatch"
+OSV_VULN_URL = "https://api.osv.dev/v1/vulns/{}"
+# 单次 querybatch 请求包含的最大查询数
+OSV_BATCH_SIZE = 128
+
+# 漏洞详情磁盘缓存（只缓存成功的查询结果；设置 OSS_GUARDIAN_NO_CACHE 可禁用）
+OSV_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "oss-guardian", "osv")
+OSV_CACHE_TTL = 7 * 86400
+OSV_CACHE_MAX_ENTRIES = 10000
+_UNSAFE_KEY_CHARS = re.compile(r'[^A-Za-z0-9._-]')
+
+# 共享 HTTP 会话：复用到 api.osv.dev 的 TCP/TLS 连接（keep-alive）
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """
+    获取模块级共享的 requests.Session（首次调用时创建）。
+    连接池大小与详情查询线程数一致，并对瞬时错误自动重试。
+
+    Returns:
+        requests.Session: 共享会话
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=None)
+                adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "User-Agent": "OSS-Guardian",
+                    "Accept": "application/json",
+                })
+                _SESSION = session
+    return _SESSION
+
+
+def _post_querybatch(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    发送一次 querybatch 请求。
+
+    Returns:
+        List[Dict]: 与 queries 按索引对齐的 results
+    """
+    response = _get_session().post(OSV_QUERY_BATCH_URL, json={"queries": queries}, timeout=10)
+    response.raise_for_status()
+    return response.json().get("results", [])
+
+
+def _query_batches(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    将查询按 OSV_BATCH_SIZE 分块并行发送，按原顺序拼接结果。
+
+    Args:
+        queries: querybatch 查询列表
+
+    Returns:
+        List[Dict]: 与 queries 按索引对齐的 results
+    """
+    chunks = [queries[i:i + OSV_BATCH_SIZE] for i in range(0, len(queries), OSV_BATCH_SIZE)]
+    if len(chunks) == 1:
+        return _post_querybatch(chunks[0])
+
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+        for chunk_results in executor.map(_post_querybatch, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def _batch_severity_reportable(vuln: Dict[str, Any]) -> bool:
+    """
+    querybatch 结果若已带严重程度，据此提前排除不会被报告的漏洞；
+    没有严重程度信息时仍需查询详情。
+    """
+    db_severity = (vuln.get("database_specific") or {}).get("severity")
+    if not isinstance(db_severity, str) or not db_severity:
+        return True
+    return db_severity.lower() in REPORTED_SEVERITIES
+
+
+def _fetch_vuln_detail(vid: str):
+    """
+    通过共享会话获取单个漏洞详情。
+
+    Returns:
+        tuple: (vid, 详情字典或 None)
+    """
+    try:
+        r = _get_session().get(OSV_VULN_URL.format(vid), timeout=10)
+        if r.status_code == 200:
+            return vid, r.json()
+    except Exception:
+        pass
+    return vid, None
+
+
+async def _fetch_all_details_async(vuln_ids) -> Dict[str, Any]:
+    """
+    在单线程事件循环中并发获取漏洞详情（需要 aiohttp）。
+
+    Args:
+        vuln_ids: 漏洞 ID 集合
+
+    Returns:
+        Dict: vuln_id -> 详情
+    """
+    sem = asyncio.Semaphore(32)
+    timeout = aiohttp.ClientTimeout(total=10)
+    headers = {"User-Agent": "OSS-Guardian", "Accept": "application/json"}
+    connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+        async def fetch(vid):
+            try:
+                async with sem, session.get(OSV_VULN_URL.format(vid)) as r:
+                    if r.status == 200:
+                        return vid, await r.json()
+            except Exception:
+                pass
+            return vid, None
+
+        results = await asyncio.gather(*(fetch(vid) for vid in vuln_ids))
+
+    return {vid: detail for vid, detail in results if detail}
+
+
+def _fetch_uncached_details(vuln_ids) -> Dict[str, Any]:
+    """
+    并发获取漏洞详情。安装了 aiohttp 时使用 asyncio，
+    否则（或已处于运行中的事件循环内时）使用线程池。
+    """
+    if aiohttp is not None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_fetch_all_details_async(vuln_ids))
+
+    vuln_details_map = {}
+    # 使用线程池并发查询，max_workers=20 表示同时发20个请求
+    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        for vid, detail in executor.map(_fetch_vuln_detail, vuln_ids):
+            if detail:
+                vuln_details_map[vid] = detail
+    return vuln_details_map
+
+
+def _fetch_vuln_details(vuln_ids) -> Dict[str, Any]:
+    """
+    获取漏洞详情：先读磁盘缓存，只对未命中的 ID 发起网络请求，
+    并把成功的结果写回缓存（失败的查询不缓存）。
+
+    Args:
+        vuln_ids: 漏洞 ID 集合
+
+    Returns:
+        Dict: vuln_id -> 详情
+    """
+    if os.environ.get("OSS_GUARDIAN_NO_CACHE"):
+        return _fetch_uncached_details(vuln_ids)
+
+    vuln_details_map = {}
+    missing = []
+    for vid in vuln_ids:
+        detail = load_cache(OSV_CACHE_DIR, _UNSAFE_KEY_CHARS.sub('_', vid), OSV_CACHE_TTL)
+        if detail:
+            vuln_details_map[vid] = detail
+        else:
+            missing.append(vid)
+
+    if missing:
+        fetched = _fetch_uncached_details(missing)
+        for vid, detail in fetched.items():
+            save_cache(OSV_CACHE_DIR, _UNSAFE_KEY_CHARS.sub('_', vid), detail)
+        if fetched:
+            prune_cache(OSV_CACHE_DIR, OSV_CACHE_MAX_ENTRIES)
+        vuln_details_map.update(fetched)
+
+    return vuln_details_map
 
 
 def match_cve(dependencies: List[Dict[str, Any]],
               cve_db_path: Optional[str] = None,
-              language: str = 'python') -> List[Dict[str, Any]]:
+              language: str = 'python',
+              fetch_details: bool = True) -> List[Dict[str, Any]]:
     """
     根据漏洞数据库匹配依赖项。
     优先使用在线 OSV API，如果网络失败则回退到本地 JSON。
@@ -25,6 +225,7 @@ def match_cve(dependencies: List[Dict[str, Any]],
         dependencies: 依赖项字典列表（必须包含 'name' 和 'version'）
         cve_db_path: 本地后备 CVE 数据库路径
         language: 项目语言（'python'、'java'、'go'）用于确定生态系统
+        fetch_details: 是否逐个查询漏洞详情；为 False 时只使用批量查询返回的 ID
 
     返回:
         List[Dict]: 匹配的 CVE 列表
@@ -34,22 +235,21 @@ def match_cve(dependencies: List[Dict[str, Any]],
     # 1. 尝试在线查询 (OSV API)
     try:
         print("[INFO] Querying official OSV database...")
-        online_matches = _query_osv_api(dependencies, language)
+        online_matches = _query_osv_api(dependencies, language, fetch_details)
         if online_matches:
             return online_matches
     except Exception as e:
         print(f"[WARN] Online CVE check failed: {e}. Switching to local database.")
 
 
-import concurrent.futures
-import requests
-
-
 # ... (保持原有的导入和 match_cve 函数不变，只替换下面的 _query_osv_api)
 
-def _query_osv_api(dependencies: List[Dict[str, Any]], language: str) -> List[Dict[str, Any]]:
+def _query_osv_api(dependencies: List[Dict[str, Any]], language: str,
+                   fetch_details: bool = True) -> List[Dict[str, Any]]:
     """
     从 OSV.dev API 批量查询漏洞（并发优化版）。
+    fetch_details 为 False 时跳过逐个 ID 的详情查询，直接用批量结果构建匹配项
+    （严重程度默认为 high，描述为空）。
     """
     ecosystem_map = {
         'python': 'PyPI', 'java': 'Maven', 'go': 'Go',
@@ -57,66 +257,52 @@ def _query_osv_api(dependencies: List[Dict[str, Any]], language: str) -> List[Di
     }
     ecosystem = ecosystem_map.get(language.lower(), 'PyPI')
 
-    payload = {"queries": []}
+    queries = []
     valid_deps = []
+    seen = set()
 
-    # 1. 构建批量查询 Payload
+    # 1. 构建批量查询 Payload（同一 (name, version) 只查询一次，保留首个依赖项）
     for dep in dependencies:
         name = dep.get('name')
         version = dep.get('version')
         if name and version and version != 'unknown':
-            payload["queries"].append({
+            key = (name.lower(), version)
+            if key in seen:
+                continue
+            seen.add(key)
+            queries.append({
                 "package": {"name": name, "ecosystem": ecosystem},
                 "version": version
             })
             valid_deps.append(dep)
 
-    if not payload["queries"]:
+    if not queries:
         return []
 
-    # 2. 发送批量索引请求 (Batch Query)
+    # 2. 发送批量索引请求 (Batch Query，大依赖集分块并行发送)
     try:
-        response = requests.post(OSV_QUERY_BATCH_URL, json=payload, timeout=10)
-        response.raise_for_status()
-        results = response.json().get("results", [])
+        results = _query_batches(queries)
     except Exception as e:
         print(f"[ERROR] OSV API request failed: {e}")
         return []
 
+    if not fetch_details:
+        return _matches_from_batch(valid_deps, results)
+
     # 3. 收集所有需要查询详情的唯一 ID (去重)
     # 我们先不急着生成 matches，而是先弄清楚有哪些 ID 需要查
     vuln_ids_to_fetch = set()
     for res in results:
         vulns = res.get("vulns", [])
         for vuln in vulns:
-            if vuln.get("id"):
+            if vuln.get("id") and _batch_severity_reportable(vuln):
                 vuln_ids_to_fetch.add(vuln.get("id"))
 
     # 4. 并发获取漏洞详情 (Detail Query)
-    # 这是一个辅助函数，用于在线程中运行
-    def fetch_vuln_detail(vid):
-        try:
-            r = requests.get(f"https://api.osv.dev/v1/vulns/{vid}", timeout=10)
-            if r.status_code == 200:
-                return vid, r.json()
-        except Exception:
-            pass
-        return vid, None
-
     vuln_details_map = {}
-
-    # 使用线程池并发查询，max_workers=20 表示同时发20个请求
     if vuln_ids_to_fetch:
         print(f"[INFO] Fetching details for {len(vuln_ids_to_fetch)} vulnerabilities...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            # 提交所有任务
-            future_to_vid = {executor.submit(fetch_vuln_detail, vid): vid for vid in vuln_ids_to_fetch}
-
-            # 获取结果
-            for future in concurrent.futures.as_completed(future_to_vid):
-                vid, detail = future.result()
-                if detail:
-                    vuln_details_map[vid] = detail
+        vuln_details_map = _fetch_vuln_details(vuln_ids_to_fetch)
 
     # 5. 组装最终结果
     matches = []
@@ -132,6 +318,15 @@ def _query_osv_api(dependencies: List[Dict[str, Any]], language: str) -> List[Di
             if not vuln_detail:
                 continue
 
+            # 提取严重程度，只保留 high 和 critical（在构建匹配项之前筛选）
+            severity = "medium"
+            if "database_specific" in vuln_detail:
+                db_severity = vuln_detail["database_specific"].get("severity")
+                if db_severity:
+                    severity = db_severity.lower()
+            if severity not in REPORTED_SEVERITIES:
+                continue
+
             # 提取 CVE ID
             cve_id = vuln_detail.get("id")
             if "aliases" in vuln_detail:
@@ -140,13 +335,6 @@ def _query_osv_api(dependencies: List[Dict[str, Any]], language: str) -> List[Di
                         cve_id = alias
                         break
 
-            # 提取严重程度
-            severity = "medium"
-            if "database_specific" in vuln_detail:
-                db_severity = vuln_detail["database_specific"].get("severity")
-                if db_severity:
-                    severity = db_severity.lower()
-
             matches.append({
                 'dependency': dep,
                 'cve_id': cve_id,
@@ -157,36 +345,34 @@ def _query_osv_api(dependencies: List[Dict[str, Any]], language: str) -> List[Di
                 'reference_url': f"https://osv.dev/vulnerability/{vuln_detail.get('id')}"
             })
 
-    # 筛选只保留 high 和 critical 的漏洞
-    matches = _filter_high_severity_only(matches)
-
     return matches
 
 
-def _filter_high_severity_only(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _matches_from_batch(valid_deps: List[Dict[str, Any]],
+                        results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    筛选漏洞列表，只保留严重程度为 high 或 critical 的漏洞。
-    没有 severity 字段的漏洞将被排除。
+    仅根据 querybatch 返回的 {id, modified} 构建匹配项，不发起详情请求。
 
     Args:
-        matches: 原始漏洞匹配列表
+        valid_deps: 与 results 按索引对齐的依赖项列表
+        results: querybatch 返回的 results
 
     Returns:
-        List[Dict]: 筛选后的漏洞列表（只包含 high 和 critical）
+        List[Dict]: 匹配的漏洞列表
     """
-    filtered = []
-
-    for match in matches:
-        # 检查是否存在 severity 字段
-        severity = match.get('severity')
-
-        # 如果没有 severity 字段，直接跳过
-        if not severity:
-            continue
-
-        # 只保留 high 和 critical（不区分大小写）
-        severity_lower = severity.lower()
-        if severity_lower in ['high', 'critical']:
-            filtered.append(match)
-
-    return filtered
+    matches = []
+    for dep, res in zip(valid_deps, results):
+        for vuln in res.get("vulns", []):
+            vuln_id = vuln.get("id")
+            if not vuln_id:
+                continue
+            matches.append({
+                'dependency': dep,
+                'cve_id': vuln_id,
+                'description': '',
+                'severity': 'high',
+                'fixed_version': "See report",
+                'source': 'OSV-Batch',
+                'reference_url': f"https://osv.dev/vulnerability/{vuln_id}"
+            })
+    return matches
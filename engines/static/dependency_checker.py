@@ -8,9 +8,17 @@ Extracts dependencies from project files and checks for known vulnerabilities.
 import os
 import re
 import json
+import xml.etree.ElementTree as ET
 from typing import List, Dict, Any, Optional
 
 
+_LANGUAGE_MARKERS = {
+    'python': ['requirements.txt', 'setup.py', 'pyproject.toml'],
+    'go': ['go.mod', 'go.sum'],
+    'java': ['pom.xml', 'build.gradle', 'build.gradle.kts', 'settings.gradle', 'settings.gradle.kts']
+}
+
+
 def _find_project_root(start_dir: str, markers: List[str]) -> str:
     """Walk upward from start_dir to find a directory containing any marker file."""
     current = os.path.abspath(start_dir)
@@ -36,25 +44,58 @@ def check_dependencies(file_path: str, language: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict]: List of dependencies with name and version
     """
-    dependencies = []
     start_dir = os.path.dirname(os.path.abspath(file_path))
-
-    language_markers = {
-        'python': ['requirements.txt', 'setup.py', 'pyproject.toml'],
-        'go': ['go.mod', 'go.sum'],
-        'java': ['pom.xml', 'build.gradle', 'build.gradle.kts', 'settings.gradle', 'settings.gradle.kts']
-    }
-    markers = language_markers.get(language, [])
+    markers = _LANGUAGE_MARKERS.get(language, [])
     project_dir = _find_project_root(start_dir, markers) if markers else start_dir
-    
-    if language == 'python':
-        dependencies.extend(_extract_python_dependencies(project_dir))
-    elif language == 'go':
-        dependencies.extend(_extract_go_dependencies(project_dir))
-    elif language == 'java':
-        dependencies.extend(_extract_java_dependencies(project_dir))
-    
-    return dependencies
+    return _extract_dependencies(project_dir, language)
+
+
+def check_dependencies_many(file_paths: List[str], language: str) -> List[Dict[str, Any]]:
+    """
+    Extract dependencies for a batch of source files of one language.
+    
+    Files are grouped by project root so each manifest is parsed once, and
+    the combined list is de-duplicated on (name, version) in first-seen order.
+    
+    Args:
+        file_paths: Paths to source files
+        language: Programming language ('python', 'go', 'java')
+        
+    Returns:
+        List[Dict]: List of dependencies with name and version
+    """
+    markers = _LANGUAGE_MARKERS.get(language, [])
+    root_by_dir: Dict[str, str] = {}
+    project_dirs: List[str] = []
+    for file_path in file_paths:
+        start_dir = os.path.dirname(os.path.abspath(file_path))
+        project_dir = root_by_dir.get(start_dir)
+        if project_dir is None:
+            project_dir = _find_project_root(start_dir, markers) if markers else start_dir
+            root_by_dir[start_dir] = project_dir
+        if project_dir not in project_dirs:
+            project_dirs.append(project_dir)
+
+    dependencies = []
+    seen = set()
+    for project_dir in project_dirs:
+        for dep in _extract_dependencies(project_dir, language):
+            key = (dep.get('name'), dep.get('version'))
+            if key not in seen:
+                seen.add(key)
+                dependencies.append(dep)
+    return dependencies
+
+
+def _extract_dependencies(project_dir: str, language: str) -> List[Dict[str, Any]]:
+    """Dispatch to the manifest parser for the given language"""
+    if language == 'python':
+        return _extract_python_dependencies(project_dir)
+    elif language == 'go':
+        return _extract_go_dependencies(project_dir)
+    elif language == 'java':
+        return _extract_java_dependencies(project_dir)
+    return []
 
 
 def _extract_python_dependencies(project_dir: str) -> List[Dict[str, Any]]:
@@ -148,19 +189,13 @@ def _extract_java_dependencies(project_dir: str) -> List[Dict[str, Any]]:
     pom_file = os.path.join(project_dir, 'pom.xml')
     if os.path.exists(pom_file):
         try:
-            with open(pom_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Find dependency blocks
-                dep_pattern = r'<dependency>.*?<groupId>(.*?)</groupId>.*?<artifactId>(.*?)</artifactId>.*?<version>(.*?)</version>.*?</dependency>'
-                for match in re.finditer(dep_pattern, content, re.DOTALL):
-                    group_id = match.group(1).strip()
-                    artifact_id = match.group(2).strip()
-                    version = match.group(3).strip()
-                    deps.append({
-                        'name': f"{group_id}:{artifact_id}",
-                        'version': version,
-                        'source': 'pom.xml'
-                    })
+            deps.extend(_parse_pom_dependencies(pom_file))
+        except ET.ParseError:
+            # Malformed XML: fall back to the lenient regex scan
+            try:
+                deps.extend(_parse_pom_dependencies_regex(pom_file))
+            except Exception:
+                pass
         except Exception:
             pass
     
@@ -187,3 +222,44 @@ def _extract_java_dependencies(project_dir: str) -> List[Dict[str, Any]]:
             pass
     
     return deps
+
+
+def _parse_pom_dependencies(pom_file: str) -> List[Dict[str, Any]]:
+    """Stream <dependency> elements out of pom.xml with ElementTree.iterparse."""
+    deps = []
+    for _, elem in ET.iterparse(pom_file, events=('end',)):
+        if elem.tag.rpartition('}')[2] != 'dependency':
+            continue
+        fields = {}
+        for child in elem:
+            fields[child.tag.rpartition('}')[2]] = (child.text or '').strip()
+        group_id = fields.get('groupId')
+        artifact_id = fields.get('artifactId')
+        version = fields.get('version')
+        if group_id and artifact_id and version:
+            deps.append({
+                'name': f"{group_id}:{artifact_id}",
+                'version': version,
+                'source': 'pom.xml'
+            })
+        elem.clear()
+    return deps
+
+
+def _parse_pom_dependencies_regex(pom_file: str) -> List[Dict[str, Any]]:
+    """Regex fallback for pom.xml files that are not well-formed XML."""
+    deps = []
+    with open(pom_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    # Find dependency blocks
+    dep_pattern = r'<dependency>.*?<groupId>(.*?)</groupId>.*?<artifactId>(.*?)</artifactId>.*?<version>(.*?)</version>.*?</dependency>'
+    for match in re.finditer(dep_pattern, content, re.DOTALL):
+        group_id = match.group(1).strip()
+        artifact_id = match.group(2).strip()
+        version = match.group(3).strip()
+        deps.append({
+            'name': f"{group_id}:{artifact_id}",
+            'version': version,
+            'source': 'pom.xml'
+        })
+    return deps
@@ -8,33 +8,50 @@ Extracts basic control-flow structures using brace matching.
 import re
 from typing import List, Dict, Any
 
+_CFG_PATTERNS = [
+    ('if', re.compile(r'^\s*if\s+(.+?)\s*\{')),
+    ('for', re.compile(r'^\s*for\s+(.+?)\s*\{')),
+    ('switch', re.compile(r'^\s*switch\s*(.*?)\s*\{')),
+    ('select', re.compile(r'^\s*select\s*\{'))
+]
+
 
 def _strip_comments(lines: List[str]) -> List[str]:
     cleaned: List[str] = []
     in_block = False
     for line in lines:
-        current = line
+        if not in_block and '/*' not in line:
+            cleaned.append(line.split('//', 1)[0] if '//' in line else line)
+            continue
+
+        # Walk the line once, keeping the spans outside block comments
+        pieces: List[str] = []
+        pos = 0
         while True:
             if in_block:
-                end = current.find('*/')
+                end = line.find('*/', pos)
                 if end == -1:
-                    current = ''
                     break
-                current = current[end + 2:]
+                pos = end + 2
                 in_block = False
-                continue
-            start = current.find('/*')
-            if start != -1:
-                end = current.find('*/', start + 2)
-                if end == -1:
-                    current = current[:start]
+                # A kept '/' directly followed by '*' opens another comment
+                if pieces and pieces[-1][-1] == '/' and line.startswith('*', pos):
+                    pieces[-1] = pieces[-1][:-1]
+                    if not pieces[-1]:
+                        pieces.pop()
+                    pos += 1
                     in_block = True
-                    break
-                current = current[:start] + current[end + 2:]
                 continue
-            break
-        current = current.split('//', 1)[0]
-        cleaned.append(current)
+            start = line.find('/*', pos)
+            if start == -1:
+                if pos < len(line):
+                    pieces.append(line[pos:])
+                break
+            if start > pos:
+                pieces.append(line[pos:start])
+            pos = start + 2
+            in_block = True
+        cleaned.append(''.join(pieces).split('//', 1)[0])
     return cleaned
 
 
@@ -42,10 +59,10 @@ def _find_block_end(lines: List[str], start_idx: int) -> int:
     brace_count = 0
     started = False
     for idx in range(start_idx, len(lines)):
-        brace_count += lines[idx].count('{')
-        if lines[idx].count('{') > 0:
-            started = True
-        brace_count -= lines[idx].count('}')
+        line = lines[idx]
+        opens = line.count('{')
+        brace_count += opens - line.count('}')
+        started = started or opens > 0
         if started and brace_count == 0:
             return idx
     return len(lines) - 1
@@ -75,19 +92,12 @@ def analyze(source_code: str) -> List[Dict[str, Any]]:
     lines = _strip_comments(source_code.splitlines())
     structures: List[Dict[str, Any]] = []
 
-    patterns = [
-        ('if', re.compile(r'^\s*if\s+(.+?)\s*\{')),
-        ('for', re.compile(r'^\s*for\s+(.+?)\s*\{')),
-        ('switch', re.compile(r'^\s*switch\s*(.*?)\s*\{')),
-        ('select', re.compile(r'^\s*select\s*\{'))
-    ]
-
     for idx, line in enumerate(lines):
         stripped = line.strip()
         if not stripped or stripped.startswith('else'):
             continue
 
-        for cfg_type, pattern in patterns:
+        for cfg_type, pattern in _CFG_PATTERNS:
             match = pattern.match(stripped)
             if not match:
                 continue
@@ -5,10 +5,22 @@ Go Syntax Checker
 Checks Go source code syntax using go build or go vet.
 """
 
-import os
 import subprocess
-import tempfile
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+# gofmt availability, probed once per process
+_GOFMT_AVAILABLE: Optional[bool] = None
+
+
+def _gofmt_available() -> bool:
+    global _GOFMT_AVAILABLE
+    if _GOFMT_AVAILABLE is None:
+        try:
+            subprocess.run(['gofmt', '-h'], capture_output=True, check=True, timeout=5)
+            _GOFMT_AVAILABLE = True
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            _GOFMT_AVAILABLE = False
+    return _GOFMT_AVAILABLE
 
 
 def check_syntax(file_path: str) -> Dict[str, Any]:
@@ -23,56 +35,65 @@ def check_syntax(file_path: str) -> Dict[str, Any]:
             - 'valid': bool - Whether syntax is valid
             - 'errors': List[str] - Error messages
     """
-    result = {
-        'valid': True,
-        'errors': []
-    }
-    
-    # Check if gofmt is available (syntax-only)
-    try:
-        subprocess.run(['gofmt', '-h'], capture_output=True, check=True, timeout=5)
-        gofmt_available = True
-    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-        gofmt_available = False
-
-    if not gofmt_available:
-        # Go toolchain not available, use basic validation
-        result['valid'] = True
-        result['errors'] = ['Go toolchain not available, skipping syntax check']
-        return result
-
-    # Try to parse/format the file using gofmt to validate syntax
-    try:
-        temp_dir = tempfile.mkdtemp()
-        temp_file = os.path.join(temp_dir, os.path.basename(file_path))
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        process = subprocess.run(
-            ['gofmt', temp_file],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if process.returncode != 0:
-            result['valid'] = False
-            result['errors'] = process.stderr.split('\n') if process.stderr else ['Unknown syntax error']
-
-        try:
-            os.remove(temp_file)
-            os.rmdir(temp_dir)
-        except Exception:
-            pass
-
-    except subprocess.TimeoutExpired:
-        result['valid'] = False
-        result['errors'] = ['Syntax check timeout']
-    except Exception as e:
-        result['valid'] = False
-        result['errors'] = [f"Syntax check error: {str(e)}"]
-    
-    return result
+    return check_syntax_many([file_path])[file_path]
+
+
+def check_syntax_many(file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Check the syntax of several Go files with a single gofmt process.
+
+    Args:
+        file_paths: Paths to Go source files
+
+    Returns:
+        Dict[str, dict]: Per-file results in the same format as check_syntax
+    """
+    results = {path: {'valid': True, 'errors': []} for path in file_paths}
+    if not file_paths:
+        return results
+
+    # Check if gofmt is available (syntax-only)
+    if not _gofmt_available():
+        # Go toolchain not available, use basic validation
+        for result in results.values():
+            result['errors'] = ['Go toolchain not available, skipping syntax check']
+        return results
+
+    # gofmt -l parses every file; formatting drift goes to stdout and is
+    # ignored, parse errors go to stderr prefixed with the file path. '--' keeps
+    # paths that start with '-' from being read as flags
+    try:
+        process = subprocess.run(
+            ['gofmt', '-l', '--'] + list(results),
+            capture_output=True,
+            text=True,
+            timeout=30 + len(results)
+        )
+    except subprocess.TimeoutExpired:
+        for result in results.values():
+            result['valid'] = False
+            result['errors'] = ['Syntax check timeout']
+        return results
+    except Exception as e:
+        for result in results.values():
+            result['valid'] = False
+            result['errors'] = [f"Syntax check error: {str(e)}"]
+        return results
+
+    if process.returncode == 0:
+        return results
+
+    # Longest path first so 'a/b.go' is not claimed by 'b.go'
+    by_length = sorted(results, key=len, reverse=True)
+    for line in process.stderr.splitlines():
+        owner = next((path for path in by_length if line.startswith(path + ':')), None)
+        if owner is None and len(results) == 1:
+            owner = by_length[0]
+        if owner is not None:
+            results[owner]['valid'] = False
+            results[owner]['errors'].append(line)
+
+    if len(results) == 1 and results[by_length[0]]['valid']:
+        results[by_length[0]] = {'valid': False, 'errors': ['Unknown syntax error']}
+
+    return results
@@ -5,50 +5,126 @@ Go Taint Analysis
 Tracks taint data flow in Go source code.
 """
 
+import functools
+import os
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Tuple
 from engines.preprocessing.go_parser import parse_go_file
 
 
+# Taint sources in Go
+_TAINT_SOURCES = [
+    r'os\.Args',
+    r'flag\.String\(',
+    r'flag\.Int\(',
+    r'flag\.Bool\(',
+    r'http\.Request\.FormValue\(',
+    r'http\.Request\.PostFormValue\(',
+    r'http\.Request\.Header\.Get\(',
+    r'c\.Query\(',
+    r'c\.Param\('
+]
+
+_SINK_RULES: List[Tuple[str, Dict[str, str]]] = [
+    (r'exec\.CommandContext\(', {
+        'rule_id': 'go_rce_exec_command',
+        'rule_name': 'Go RCE - exec.CommandContext',
+        'severity': 'critical'
+    }),
+    (r'exec\.Command\(', {
+        'rule_id': 'go_rce_exec_command',
+        'rule_name': 'Go RCE - exec.Command',
+        'severity': 'critical'
+    }),
+    (r'exec\.Run\(', {
+        'rule_id': 'go_rce_exec_command',
+        'rule_name': 'Go RCE - exec.Run',
+        'severity': 'critical'
+    }),
+    (r'(os|syscall)\.Exec\(', {
+        'rule_id': 'go_os_exec',
+        'rule_name': 'Go RCE - os/exec Usage',
+        'severity': 'critical'
+    }),
+    (r'sql\.DB\.(Query|Exec)\(', {
+        'rule_id': 'go_sql_injection',
+        'rule_name': 'Go SQL Injection - String Concatenation',
+        'severity': 'high'
+    }),
+    (r'os\.(OpenFile|Create|WriteFile)\(', {
+        'rule_id': 'go_file_write',
+        'rule_name': 'Go File Write Operation',
+        'severity': 'medium'
+    }),
+    (r'net\.Dial\(', {
+        'rule_id': 'go_network_dial',
+        'rule_name': 'Go Network - net.Dial()',
+        'severity': 'medium'
+    })
+]
+
+_TAINT_SOURCE_ANY = re.compile('|'.join(f'(?:{p})' for p in _TAINT_SOURCES))
+_SINK_RULES_COMPILED = [(re.compile(p), info) for p, info in _SINK_RULES]
+# All sinks fused into one alternation; group r<i> names the rule that matched
+_FUSED_SINK = re.compile('|'.join(f'(?P<r{i}>{p})' for i, (p, _) in enumerate(_SINK_RULES)))
+
+_ASSIGN_RE = re.compile(r':=|(?<![=!<>])=(?![=])')
+_CONTROL_PREFIX_RE = re.compile(r'^(if|for|switch)\s+')
+_VAR_PREFIX_RE = re.compile(r'^var\s+')
+_NAME_TOKEN_RE = re.compile(r'(?<![\w\.])\w+')
+_PLAIN_NAME_RE = re.compile(r'\w+')
+
+
 def _strip_comments(lines: List[str]) -> List[str]:
     cleaned: List[str] = []
     in_block = False
     for line in lines:
-        current = line
+        if not in_block and '/*' not in line:
+            cleaned.append(line.split('//', 1)[0] if '//' in line else line)
+            continue
+
+        # Walk the line once, keeping the spans outside block comments
+        pieces: List[str] = []
+        pos = 0
         while True:
             if in_block:
-                end = current.find('*/')
+                end = line.find('*/', pos)
                 if end == -1:
-                    current = ''
                     break
-                current = current[end + 2:]
+                pos = end + 2
                 in_block = False
-                continue
-            start = current.find('/*')
-            if start != -1:
-                end = current.find('*/', start + 2)
-                if end == -1:
-                    current = current[:start]
+                # A kept '/' directly followed by '*' opens another comment
+                if pieces and pieces[-1][-1] == '/' and line.startswith('*', pos):
+                    pieces[-1] = pieces[-1][:-1]
+                    if not pieces[-1]:
+                        pieces.pop()
+                    pos += 1
                     in_block = True
-                    break
-                current = current[:start] + current[end + 2:]
                 continue
-            break
-        current = current.split('//', 1)[0]
-        cleaned.append(current)
+            start = line.find('/*', pos)
+            if start == -1:
+                if pos < len(line):
+                    pieces.append(line[pos:])
+                break
+            if start > pos:
+                pieces.append(line[pos:start])
+            pos = start + 2
+            in_block = True
+        cleaned.append(''.join(pieces).split('//', 1)[0])
     return cleaned
 
 
 def _extract_assigned_vars(line: str) -> Tuple[List[str], Optional[str]]:
-    match = re.search(r':=|(?<![=!<>])=(?![=])', line)
+    match = _ASSIGN_RE.search(line)
     if not match:
         return [], None
     lhs = line[:match.start()].strip()
     rhs = line[match.end():].strip()
 
-    lhs = re.sub(r'^(if|for|switch)\s+', '', lhs)
+    lhs = _CONTROL_PREFIX_RE.sub('', lhs)
     lhs = lhs.replace('range ', '')
-    lhs = re.sub(r'^var\s+', '', lhs)
+    lhs = _VAR_PREFIX_RE.sub('', lhs)
 
     vars_found: List[str] = []
     for part in lhs.split(','):
@@ -62,26 +138,48 @@ def _extract_assigned_vars(line: str) -> Tuple[List[str], Optional[str]]:
     return vars_found, rhs
 
 
+@functools.lru_cache(maxsize=4096)
+def _word_re(var_name: str) -> re.Pattern:
+    return re.compile(r'(?<![\w\.])' + re.escape(var_name) + r'(?![\w])')
+
+
 def _line_contains_var(text: str, var_name: str) -> bool:
     if not var_name:
         return False
-    pattern = r'(?<![\w\.])' + re.escape(var_name) + r'(?![\w])'
-    return re.search(pattern, text) is not None
+    return _word_re(var_name).search(text) is not None
+
+
+def _name_tokens(text: str) -> Set[str]:
+    """Collect every plain identifier that _line_contains_var would match in text."""
+    return set(_NAME_TOKEN_RE.findall(text))
+
+
+def _contains_var(text: str, tokens: Set[str], var_name: str) -> bool:
+    if var_name in tokens:
+        return True
+    if _PLAIN_NAME_RE.fullmatch(var_name):
+        return False
+    # Names such as 'x.y' or '*p' are not single tokens; fall back to the regex
+    return _line_contains_var(text, var_name)
 
 
 def _find_taint_origin(rhs: str, tainted_vars: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not tainted_vars:
+        return None
+    tokens = _name_tokens(rhs)
     for var_name, origin in tainted_vars.items():
-        if _line_contains_var(rhs, var_name):
+        if _contains_var(rhs, tokens, var_name):
             return origin
     return None
 
 
-def analyze(file_path: str) -> List[Dict[str, Any]]:
+def analyze(file_path: str, source_code: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Perform taint analysis on Go source code.
 
     Args:
         file_path: Path to Go source file
+        source_code: Already-loaded source; when given the file is not read again
 
     Returns:
         List[Dict]: Taint flow information
@@ -89,65 +187,13 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
     taint_flows: List[Dict[str, Any]] = []
 
     try:
-        parsed_data = parse_go_file(file_path)
-        source_code = parsed_data.get('source_code', '')
+        if source_code is None:
+            parsed_data = parse_go_file(file_path)
+            source_code = parsed_data.get('source_code', '')
         lines = _strip_comments(source_code.split('\n'))
     except Exception:
         return taint_flows
 
-    # Taint sources in Go
-    taint_sources = [
-        r'os\.Args',
-        r'flag\.String\(',
-        r'flag\.Int\(',
-        r'flag\.Bool\(',
-        r'http\.Request\.FormValue\(',
-        r'http\.Request\.PostFormValue\(',
-        r'http\.Request\.Header\.Get\(',
-        r'c\.Query\(',
-        r'c\.Param\('
-    ]
-
-    sink_rules: List[Tuple[str, Dict[str, str]]] = [
-        (r'exec\.CommandContext\(', {
-            'rule_id': 'go_rce_exec_command',
-            'rule_name': 'Go RCE - exec.CommandContext',
-            'severity': 'critical'
-        }),
-        (r'exec\.Command\(', {
-            'rule_id': 'go_rce_exec_command',
-            'rule_name': 'Go RCE - exec.Command',
-            'severity': 'critical'
-        }),
-        (r'exec\.Run\(', {
-            'rule_id': 'go_rce_exec_command',
-            'rule_name': 'Go RCE - exec.Run',
-            'severity': 'critical'
-        }),
-        (r'(os|syscall)\.Exec\(', {
-            'rule_id': 'go_os_exec',
-            'rule_name': 'Go RCE - os/exec Usage',
-            'severity': 'critical'
-        }),
-        (r'sql\.DB\.(Query|Exec)\(', {
-            'rule_id': 'go_sql_injection',
-            'rule_name': 'Go SQL Injection - String Concatenation',
-            'severity': 'high'
-        }),
-        (r'os\.(OpenFile|Create|WriteFile)\(', {
-            'rule_id': 'go_file_write',
-            'rule_name': 'Go File Write Operation',
-            'severity': 'medium'
-        }),
-        (r'net\.Dial\(', {
-            'rule_id': 'go_network_dial',
-            'rule_name': 'Go Network - net.Dial()',
-            'severity': 'medium'
-        })
-    ]
-
-    sink_patterns = [pattern for pattern, _ in sink_rules]
-
     tainted_vars: Dict[str, Dict[str, Any]] = {}
     seen_flows = set()
 
@@ -156,10 +202,10 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
         if not line:
             continue
 
-        sources_present = [p for p in taint_sources if re.search(p, line)]
+        has_source = _TAINT_SOURCE_ANY.search(line) is not None
         assigned_vars, rhs = _extract_assigned_vars(line)
 
-        if sources_present and assigned_vars:
+        if has_source and assigned_vars:
             for var_name in assigned_vars:
                 tainted_vars[var_name] = {
                     'source_line': i,
@@ -171,19 +217,23 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
                 for var_name in assigned_vars:
                     tainted_vars[var_name] = origin
 
-        matched_sink = None
-        matched_text = ''
-        for pattern, info in sink_rules:
-            match = re.search(pattern, line)
+        sink_match = _FUSED_SINK.search(line)
+        if sink_match is None:
+            continue
+        # The fused regex reports the leftmost sink; an earlier rule matching
+        # further right still takes precedence, as in rule order.
+        rule_idx = int(sink_match.lastgroup[1:])
+        matched_sink = _SINK_RULES_COMPILED[rule_idx][1]
+        matched_text = sink_match.group(0)
+        for pattern, info in _SINK_RULES_COMPILED[:rule_idx]:
+            match = pattern.search(line)
             if match:
                 matched_sink = info
                 matched_text = match.group(0)
                 break
-        if matched_sink is None and not any(re.search(pattern, line) for pattern in sink_patterns):
-            continue
 
         # Direct source to sink on same line
-        if matched_sink and sources_present:
+        if matched_sink and has_source:
             key = (i, i, 'direct', matched_sink['rule_id'])
             if key not in seen_flows:
                 taint_flows.append({
@@ -201,8 +251,9 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
                 seen_flows.add(key)
 
         # Variable-based flows
+        tokens = _name_tokens(line) if tainted_vars else set()
         for var_name, origin in tainted_vars.items():
-            if not _line_contains_var(line, var_name):
+            if not _contains_var(line, tokens, var_name):
                 continue
             if not matched_sink:
                 continue
@@ -226,3 +277,29 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
             seen_flows.add(key)
 
     return taint_flows
+
+
+def analyze_many(file_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Perform taint analysis on several Go files in parallel.
+
+    The analysis is CPU-bound regex work that holds the GIL, so files are spread
+    over a process pool. Fewer than four files are analyzed in-process.
+    This is a library entry point; analyze_file and analyze_multiple_files do
+    not call it.
+
+    Args:
+        file_paths: Paths to Go source files
+        max_workers: Worker processes (default: CPU count)
+
+    Returns:
+        Dict[str, List[Dict]]: Taint flows keyed by file path
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(file_paths) < 4:
+        return {path: analyze(path) for path in file_paths}
+
+    workers = min(workers, len(file_paths))
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(file_paths, executor.map(analyze, file_paths, chunksize=chunksize)))
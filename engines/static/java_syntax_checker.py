@@ -7,9 +7,29 @@ Checks Java source code syntax using javac.
 
 import os
 import re
+import shutil
 import subprocess
 import tempfile
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from engines.preprocessing.java_parser import strip_comments
+
+try:
+    import javalang
+except ImportError:
+    javalang = None
+
+# javac availability, probed once per process
+_JAVAC_AVAILABLE: Optional[bool] = None
+
+# Files handed to one javac process
+JAVAC_BATCH_SIZE = 256
+# javac stops reporting after 100 errors/warnings by default, which would leave
+# later files in a batch without diagnostics
+_JAVAC_MAX_DIAGNOSTICS = '1000000'
+
+# 'path/Foo.java:12: error: ...' opens a diagnostic, 'N errors' closes the report
+_DIAGNOSTIC_RE = re.compile(r'^(.+?\.java):\d+: (?:error|warning):')
+_SUMMARY_RE = re.compile(r'^\d+ (?:errors?|warnings?)$')
 
 
 def _read_source(file_path: str) -> str:
@@ -21,69 +41,59 @@ def _read_source(file_path: str) -> str:
             return f.read()
 
 
-def _strip_comments(source_code: str) -> str:
-    lines = source_code.splitlines()
-    cleaned = []
-    in_block = False
-    for line in lines:
-        current = line
-        while True:
-            if in_block:
-                end = current.find('*/')
-                if end == -1:
-                    current = ''
-                    break
-                current = current[end + 2:]
-                in_block = False
-                continue
-            start = current.find('/*')
-            if start != -1:
-                end = current.find('*/', start + 2)
-                if end == -1:
-                    current = current[:start]
-                    in_block = True
-                    break
-                current = current[:start] + current[end + 2:]
-                continue
-            break
-        current = current.split('//', 1)[0]
-        cleaned.append(current)
-    return '\n'.join(cleaned)
-
-
 def _extract_public_type_name(source_code: str) -> Optional[str]:
-    cleaned = _strip_comments(source_code)
+    cleaned = strip_comments(source_code)
     match = re.search(r'\bpublic\s+(class|interface|enum|record)\s+([A-Za-z_][\w]*)', cleaned)
     if match:
         return match.group(2)
     return None
 
 
+def _probe_javac() -> bool:
+    try:
+        subprocess.run(['javac', '-version'], capture_output=True, check=True, timeout=5)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+
+def _javac_available() -> bool:
+    global _JAVAC_AVAILABLE
+    if _JAVAC_AVAILABLE is None:
+        _JAVAC_AVAILABLE = _probe_javac()
+    return _JAVAC_AVAILABLE
+
+
+_SYNTAX_MARKERS = [
+    'illegal start of',
+    'not a statement',
+    "expected",
+    'reached end of file while parsing',
+    'unclosed string literal',
+    'class, interface, or enum expected',
+    'identifier expected'
+]
+
+_NON_SYNTAX_MARKERS = [
+    'cannot find symbol',
+    'package ',
+    'is public, should be declared in a file named',
+    'class file for',
+    'module',
+    'cannot access',
+    'bad class file',
+    'duplicate class'
+]
+
+# One case-insensitive scan over javac output per marker list
+_SYNTAX_MARKER_RE = re.compile('|'.join(map(re.escape, _SYNTAX_MARKERS)), re.IGNORECASE)
+_NON_SYNTAX_MARKER_RE = re.compile('|'.join(map(re.escape, _NON_SYNTAX_MARKERS)), re.IGNORECASE)
+
+
 def _is_non_syntax_failure(stderr: str) -> bool:
-    text = stderr.lower()
-    syntax_markers = [
-        'illegal start of',
-        'not a statement',
-        "expected",
-        'reached end of file while parsing',
-        'unclosed string literal',
-        'class, interface, or enum expected',
-        'identifier expected'
-    ]
-    for marker in syntax_markers:
-        if marker in text:
-            return False
-
-    non_syntax_markers = [
-        'cannot find symbol',
-        'package ',
-        'is public, should be declared in a file named',
-        'class file for',
-        'module',
-        'cannot access',
-        'bad class file'
-    ]
-    return any(marker in text for marker in non_syntax_markers)
+    if _SYNTAX_MARKER_RE.search(stderr):
+        return False
+    return _NON_SYNTAX_MARKER_RE.search(stderr) is not None
 
 
 def check_syntax(file_path: str) -> Dict[str, Any]:
@@ -98,43 +108,109 @@ def check_syntax(file_path: str) -> Dict[str, Any]:
             - 'valid': bool - Whether syntax is valid
             - 'errors': List[str] - Error messages
     """
-    result = {
-        'valid': True,
-        'errors': []
-    }
-    
-    source_code = _read_source(file_path)
+    return check_syntax_many([file_path])[file_path]
 
-    # Try syntax-only parsing via javalang if available
-    try:
-        import javalang
+
+def check_syntax_source(source_code: str, filename_hint: str = 'Main.java') -> Dict[str, Any]:
+    """
+    Check the syntax of Java source that the caller has already loaded.
+
+    Args:
+        source_code: Java source code
+        filename_hint: File name to compile under when the source declares
+            no public type
+
+    Returns:
+        dict: Syntax check results in the same format as check_syntax
+    """
+    return _check_sources({filename_hint: source_code})[filename_hint]
+
+
+def check_syntax_many(file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Check the syntax of several Java files, compiling them with a single
+    javac process where javalang cannot decide.
+
+    Args:
+        file_paths: Paths to Java source files
+
+    Returns:
+        Dict[str, dict]: Per-file results in the same format as check_syntax
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    sources: Dict[str, str] = {}
+
+    for path in file_paths:
         try:
-            javalang.parse.parse(source_code)
-            return result
-        except javalang.parser.JavaSyntaxError as exc:
-            result['valid'] = False
-            result['errors'] = [str(exc)]
-            return result
-    except Exception:
-        pass
+            sources[path] = _read_source(path)
+        except Exception as e:
+            results[path] = {'valid': False, 'errors': [f"Syntax check error: {str(e)}"]}
+
+    results.update(_check_sources(sources))
+    return results
+
+
+def _check_sources(sources: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Check sources keyed by path; javac sees each under its public type or base name."""
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, str] = {}
+
+    for path, source_code in sources.items():
+        result = _check_with_javalang(source_code)
+        if result is not None:
+            results[path] = result
+        else:
+            pending[path] = source_code
+
+    if not pending:
+        return results
 
     # Check if javac is available
+    if not _javac_available():
+        for path in pending:
+            results[path] = {
+                'valid': True,
+                'errors': ['Java compiler not available, skipping syntax check']
+            }
+        return results
+
+    paths = list(pending)
+    for start in range(0, len(paths), JAVAC_BATCH_SIZE):
+        chunk = {path: pending[path] for path in paths[start:start + JAVAC_BATCH_SIZE]}
+        results.update(_compile_batch(chunk))
+    return results
+
+
+def _check_with_javalang(source_code: str) -> Optional[Dict[str, Any]]:
+    """Return a result when javalang settles the check, None to fall back to javac."""
+    if javalang is None:
+        return None
     try:
-        subprocess.run(['javac', '-version'], capture_output=True, check=True, timeout=5)
-    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-        result['valid'] = True
-        result['errors'] = ['Java compiler not available, skipping syntax check']
-        return result
-    
-    # Try to compile the file
-    try:
-        temp_dir = tempfile.mkdtemp()
-        public_name = _extract_public_type_name(source_code)
-        target_name = f"{public_name}.java" if public_name else os.path.basename(file_path)
-        temp_file = os.path.join(temp_dir, target_name)
+        javalang.parse.parse(source_code)
+        return {'valid': True, 'errors': []}
+    except javalang.parser.JavaSyntaxError as exc:
+        return {'valid': False, 'errors': [str(exc)]}
+    except Exception:
+        # Lexer or internal parser errors: let javac decide
+        return None
+
 
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            f.write(source_code)
+def _compile_batch(sources: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Compile sources with one javac run and attribute diagnostics per file."""
+    results = {path: {'valid': True, 'errors': []} for path in sources}
+    temp_dir = tempfile.mkdtemp()
+    try:
+        # One subdirectory per source so equal public type names cannot clash
+        owners: Dict[str, str] = {}
+        for index, (path, source_code) in enumerate(sources.items()):
+            public_name = _extract_public_type_name(source_code)
+            target_name = f"{public_name}.java" if public_name else os.path.basename(path)
+            source_dir = os.path.join(temp_dir, 'src', str(index))
+            os.makedirs(source_dir)
+            temp_file = os.path.join(source_dir, target_name)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(source_code)
+            owners[temp_file] = path
 
         process = subprocess.run(
             [
@@ -143,42 +219,64 @@ def check_syntax(file_path: str) -> Dict[str, Any]:
                 '-J-Duser.region=US',
                 '-Xlint:none',
                 '-proc:none',
-                '-d', temp_dir,
-                temp_file
-            ],
+                '-Xmaxerrs', _JAVAC_MAX_DIAGNOSTICS,
+                '-Xmaxwarns', _JAVAC_MAX_DIAGNOSTICS,
+                '-d', os.path.join(temp_dir, 'out'),
+            ] + list(owners),
             capture_output=True,
             text=True,
-            timeout=30
+            timeout=30 + len(owners)
         )
-        
+
         if process.returncode != 0:
             stderr = process.stderr or ''
-            if _is_non_syntax_failure(stderr):
-                result['valid'] = True
-                result['errors'] = [
-                    'Compilation issues detected (likely classpath/module); syntax not verified.'
-                ] + stderr.split('\n')
+            if len(sources) == 1:
+                per_file = {next(iter(sources)): stderr}
             else:
-                result['valid'] = False
-                result['errors'] = stderr.split('\n') if stderr else ['Unknown syntax error']
+                per_file = _split_diagnostics(stderr, owners)
+                if not per_file:
+                    # Nothing attributable, judge every file by the whole output
+                    per_file = dict.fromkeys(sources, stderr)
+            broken = False
+            for path, text in per_file.items():
+                if _is_non_syntax_failure(text):
+                    results[path]['errors'] = [
+                        'Compilation issues detected (likely classpath/module); syntax not verified.'
+                    ] + text.split('\n')
+                else:
+                    broken = True
+                    results[path]['valid'] = False
+                    results[path]['errors'] = text.split('\n') if text else ['Unknown syntax error']
+            # javac skips its later phases once any file fails to parse, so files
+            # without diagnostics are compiled again without the broken ones
+            unchecked = {path: sources[path] for path in sources if path not in per_file}
+            if broken and unchecked:
+                results.update(_compile_batch(unchecked))
 
-        # Cleanup temp output
-        try:
-            for root, _, files in os.walk(temp_dir):
-                for name in files:
-                    try:
-                        os.remove(os.path.join(root, name))
-                    except Exception:
-                        pass
-            os.rmdir(temp_dir)
-        except Exception:
-            pass
-                
     except subprocess.TimeoutExpired:
-        result['valid'] = False
-        result['errors'] = ['Syntax check timeout']
-    except Exception as e:
-        result['valid'] = False
-        result['errors'] = [f"Syntax check error: {str(e)}"]
-    
-    return result
+        for result in results.values():
+            result['valid'] = False
+            result['errors'] = ['Syntax check timeout']
+    except Exception as e:
+        for result in results.values():
+            result['valid'] = False
+            result['errors'] = [f"Syntax check error: {str(e)}"]
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return results
+
+
+def _split_diagnostics(stderr: str, owners: Dict[str, str]) -> Dict[str, str]:
+    """Group javac output lines under the source file their diagnostic names."""
+    per_file: Dict[str, List[str]] = {}
+    current = None
+    for line in stderr.split('\n'):
+        match = _DIAGNOSTIC_RE.match(line)
+        if match:
+            current = owners.get(os.path.normpath(match.group(1)))
+        elif _SUMMARY_RE.match(line):
+            current = None
+        if current is not None:
+            per_file.setdefault(current, []).append(line)
+    return {path: '\n'.join(lines) for path, lines in per_file.items()}
@@ -5,46 +5,89 @@ Java Taint Analysis
 Tracks taint data flow in Java source code.
 """
 
+import functools
 import re
 from typing import List, Dict, Any, Optional, Tuple
-from engines.preprocessing.java_parser import parse_java_file
-
-
-def _strip_comments(lines: List[str]) -> List[str]:
-    cleaned: List[str] = []
-    in_block = False
-    for line in lines:
-        current = line
-        while True:
-            if in_block:
-                end = current.find('*/')
-                if end == -1:
-                    current = ''
-                    break
-                current = current[end + 2:]
-                in_block = False
-                continue
-            start = current.find('/*')
-            if start != -1:
-                end = current.find('*/', start + 2)
-                if end == -1:
-                    current = current[:start]
-                    in_block = True
-                    break
-                current = current[:start] + current[end + 2:]
-                continue
-            break
-        current = current.split('//', 1)[0]
-        cleaned.append(current)
-    return cleaned
+from engines.preprocessing.java_parser import parse_java_file, strip_comments
+
+
+# Taint sources in Java
+_TAINT_SOURCES = [
+    r'System\.in',
+    r'args\s*\[',
+    r'request\.getParameter\(',
+    r'request\.getHeader\(',
+    r'request\.getQueryString\(',
+    r'request\.getCookies\(',
+    r'session\.getAttribute\('
+]
+
+_SINK_RULES: List[Tuple[str, Dict[str, str]]] = [
+    (r'Runtime\.getRuntime\(\)\.exec\(', {
+        'rule_id': 'java_rce_runtime_exec',
+        'rule_name': 'Java RCE - Runtime.exec()',
+        'severity': 'critical'
+    }),
+    (r'new\s+ProcessBuilder\(|ProcessBuilder\(', {
+        'rule_id': 'java_rce_processbuilder',
+        'rule_name': 'Java RCE - ProcessBuilder',
+        'severity': 'critical'
+    }),
+    (r'(Statement|PreparedStatement)\.execute(Query|Update|)\(', {
+        'rule_id': 'java_sql_injection',
+        'rule_name': 'Java SQL Injection - String Concatenation',
+        'severity': 'high'
+    }),
+    (r'(FileWriter|FileOutputStream|PrintWriter)\(', {
+        'rule_id': 'java_file_operation',
+        'rule_name': 'Java File Operation',
+        'severity': 'medium'
+    }),
+    (r'(Socket|URL|HttpURLConnection)\s*\(|\.connect\s*\(', {
+        'rule_id': 'java_network_connection',
+        'rule_name': 'Java Network Connection',
+        'severity': 'medium'
+    }),
+    (r'(ObjectInputStream|readObject|readUnshared)\s*\(', {
+        'rule_id': 'java_deserialization',
+        'rule_name': 'Java Deserialization Risk',
+        'severity': 'high'
+    })
+]
+
+_TAINT_SOURCE_ANY = re.compile('|'.join(f'(?:{p})' for p in _TAINT_SOURCES))
+_SINK_RULES_COMPILED = [(re.compile(p), info) for p, info in _SINK_RULES]
+# All sinks fused into one alternation; group r<i> names the rule that matched.
+# The lookahead lists the possible first characters of every sink pattern so the
+# engine can skip other positions quickly; keep it in sync with _SINK_RULES.
+_SINK_FIRST_CHARS = r'[RnPSFUH.Or]'
+_FUSED_SINK = re.compile(
+    f'(?={_SINK_FIRST_CHARS})(?:'
+    + '|'.join(f'(?P<r{i}>{p})' for i, (p, _) in enumerate(_SINK_RULES))
+    + ')'
+)
+
+# Identifiers not preceded by a word character or '.', the only plain names _word_re accepts
+_NAME_TOKEN_RE = re.compile(r'(?<![\w\.])\w+')
+_PLAIN_NAME_RE = re.compile(r'\w+')
+
+
+def _find_assign_eq(line: str) -> int:
+    """Index of the first '=' that is not part of ==, !=, <= or >=, else -1."""
+    idx = line.find('=')
+    while idx != -1:
+        if (idx == 0 or line[idx - 1] not in '=!<>') and line[idx + 1:idx + 2] != '=':
+            return idx
+        idx = line.find('=', idx + 1)
+    return -1
 
 
 def _extract_assigned_vars(line: str) -> Tuple[List[str], Optional[str]]:
-    match = re.search(r'(?<![=!<>])=(?![=])', line)
-    if not match:
+    idx = _find_assign_eq(line)
+    if idx == -1:
         return [], None
-    lhs = line[:match.start()].strip()
-    rhs = line[match.end():].strip()
+    lhs = line[:idx].strip()
+    rhs = line[idx + 1:].strip()
 
     vars_found: List[str] = []
     for part in lhs.split(','):
@@ -59,26 +102,52 @@ def _extract_assigned_vars(line: str) -> Tuple[List[str], Optional[str]]:
     return vars_found, rhs
 
 
+@functools.lru_cache(maxsize=4096)
+def _word_re(var_name: str) -> re.Pattern:
+    return re.compile(r'(?<![\w\.])' + re.escape(var_name) + r'(?![\w])')
+
+
 def _line_contains_var(text: str, var_name: str) -> bool:
     if not var_name:
         return False
-    pattern = r'(?<![\w\.])' + re.escape(var_name) + r'(?![\w])'
-    return re.search(pattern, text) is not None
-
-
-def _find_taint_origin(rhs: str, tainted_vars: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    for var_name, origin in tainted_vars.items():
-        if _line_contains_var(rhs, var_name):
-            return origin
-    return None
-
-
-def analyze(file_path: str) -> List[Dict[str, Any]]:
+    return _word_re(var_name).search(text) is not None
+
+
+class _TaintedVars:
+    """Origins of tainted variables, looked up by the names a line mentions."""
+
+    def __init__(self) -> None:
+        self.origins: Dict[str, Dict[str, Any]] = {}
+        # Order in which names were first tainted; earlier names take precedence
+        self._rank: Dict[str, int] = {}
+        # Names such as 'this.x' or 'arr[0]' that are not single tokens
+        self._complex: List[str] = []
+
+    def add(self, var_name: str, origin: Dict[str, Any]) -> None:
+        if var_name not in self.origins:
+            self._rank[var_name] = len(self._rank)
+            if not _PLAIN_NAME_RE.fullmatch(var_name):
+                self._complex.append(var_name)
+        self.origins[var_name] = origin
+
+    def mentioned_in(self, text: str) -> List[str]:
+        """Return the tainted names that occur in text, in first-taint order."""
+        if not self.origins:
+            return []
+        hits = {token for token in _NAME_TOKEN_RE.findall(text) if token in self.origins}
+        for var_name in self._complex:
+            if _line_contains_var(text, var_name):
+                hits.add(var_name)
+        return sorted(hits, key=self._rank.__getitem__)
+
+
+def analyze(file_path: str, source_code: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Perform taint analysis on Java source code.
 
     Args:
         file_path: Path to Java source file
+        source_code: Already-loaded source; when given the file is not read again
 
     Returns:
         List[Dict]: Taint flow information
@@ -86,59 +155,14 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
     taint_flows: List[Dict[str, Any]] = []
 
     try:
-        parsed_data = parse_java_file(file_path)
-        source_code = parsed_data.get('source_code', '')
-        lines = _strip_comments(source_code.split('\n'))
+        if source_code is None:
+            parsed_data = parse_java_file(file_path)
+            source_code = parsed_data.get('source_code', '')
+        lines = strip_comments(source_code).split('\n')
     except Exception:
         return taint_flows
 
-    # Taint sources in Java
-    taint_sources = [
-        r'System\.in',
-        r'args\s*\[',
-        r'request\.getParameter\(',
-        r'request\.getHeader\(',
-        r'request\.getQueryString\(',
-        r'request\.getCookies\(',
-        r'session\.getAttribute\('
-    ]
-
-    sink_rules: List[Tuple[str, Dict[str, str]]] = [
-        (r'Runtime\.getRuntime\(\)\.exec\(', {
-            'rule_id': 'java_rce_runtime_exec',
-            'rule_name': 'Java RCE - Runtime.exec()',
-            'severity': 'critical'
-        }),
-        (r'new\s+ProcessBuilder\(|ProcessBuilder\(', {
-            'rule_id': 'java_rce_processbuilder',
-            'rule_name': 'Java RCE - ProcessBuilder',
-            'severity': 'critical'
-        }),
-        (r'(Statement|PreparedStatement)\.execute(Query|Update|)\(', {
-            'rule_id': 'java_sql_injection',
-            'rule_name': 'Java SQL Injection - String Concatenation',
-            'severity': 'high'
-        }),
-        (r'(FileWriter|FileOutputStream|PrintWriter)\(', {
-            'rule_id': 'java_file_operation',
-            'rule_name': 'Java File Operation',
-            'severity': 'medium'
-        }),
-        (r'(Socket|URL|HttpURLConnection)\s*\(|\.connect\s*\(', {
-            'rule_id': 'java_network_connection',
-            'rule_name': 'Java Network Connection',
-            'severity': 'medium'
-        }),
-        (r'(ObjectInputStream|readObject|readUnshared)\s*\(', {
-            'rule_id': 'java_deserialization',
-            'rule_name': 'Java Deserialization Risk',
-            'severity': 'high'
-        })
-    ]
-
-    sink_patterns = [pattern for pattern, _ in sink_rules]
-
-    tainted_vars: Dict[str, Dict[str, Any]] = {}
+    tainted_vars = _TaintedVars()
     seen_flows = set()
 
     for i, raw_line in enumerate(lines, 1):
@@ -146,34 +170,40 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
         if not line:
             continue
 
-        sources_present = [p for p in taint_sources if re.search(p, line)]
-        assigned_vars, rhs = _extract_assigned_vars(line)
+        has_source = _TAINT_SOURCE_ANY.search(line) is not None
+        assigned_vars, rhs = _extract_assigned_vars(line) if '=' in line else ([], None)
 
-        if sources_present and assigned_vars:
+        if has_source and assigned_vars:
             for var_name in assigned_vars:
-                tainted_vars[var_name] = {
+                tainted_vars.add(var_name, {
                     'source_line': i,
                     'source_code': line
-                }
+                })
         elif assigned_vars and rhs:
-            origin = _find_taint_origin(rhs, tainted_vars)
-            if origin:
+            mentioned = tainted_vars.mentioned_in(rhs)
+            if mentioned:
+                origin = tainted_vars.origins[mentioned[0]]
                 for var_name in assigned_vars:
-                    tainted_vars[var_name] = origin
+                    tainted_vars.add(var_name, origin)
 
-        matched_sink = None
-        matched_text = ''
-        for pattern, info in sink_rules:
-            match = re.search(pattern, line)
+        # Every sink pattern ends in a call, so a line without '(' cannot hold one
+        sink_match = _FUSED_SINK.search(line) if '(' in line else None
+        if sink_match is None:
+            continue
+        # The fused regex reports the leftmost sink; an earlier rule matching
+        # further right still takes precedence, as in rule order.
+        rule_idx = int(sink_match.lastgroup[1:])
+        matched_sink = _SINK_RULES_COMPILED[rule_idx][1]
+        matched_text = sink_match.group(0)
+        for pattern, info in _SINK_RULES_COMPILED[:rule_idx]:
+            match = pattern.search(line)
             if match:
                 matched_sink = info
                 matched_text = match.group(0)
                 break
-        if matched_sink is None and not any(re.search(pattern, line) for pattern in sink_patterns):
-            continue
 
         # Direct source to sink on same line
-        if matched_sink and sources_present:
+        if matched_sink and has_source:
             key = (i, i, 'direct', matched_sink['rule_id'])
             if key not in seen_flows:
                 taint_flows.append({
@@ -191,11 +221,8 @@ def analyze(file_path: str) -> List[Dict[str, Any]]:
                 seen_flows.add(key)
 
         # Variable-based flows
-        for var_name, origin in tainted_vars.items():
-            if not _line_contains_var(line, var_name):
-                continue
-            if not matched_sink:
-                continue
+        for var_name in tainted_vars.mentioned_in(line):
+            origin = tainted_vars.origins[var_name]
             key = (origin['source_line'], i, var_name, matched_sink['rule_id'])
             if key in seen_flows:
                 continue
@@ -5,8 +5,49 @@ Pattern Matcher
 Uses regular expressions to match security rules from rules.yaml against source code.
 """
 
+import bisect
+import functools
+import json
 import re
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+
+from engines.analysis.cache_manager import MemoryCache, content_key, load_cache, save_cache
+
+
+# Lookarounds and \A/\Z can behave differently on a single line than on the
+# whole buffer, so patterns using them are still scanned line by line
+_LINE_SENSITIVE_RE = re.compile(r'\(\?<?[=!]|\\[AZ]')
+
+# Part of every cache key; bump whenever the match format changes
+_CACHE_VERSION = '1'
+_memory_cache = MemoryCache()
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_rule_pattern(pattern: str) -> Tuple[re.Pattern, bool]:
+    """Compile a rule pattern once per process; also report whether it is line sensitive."""
+    # MULTILINE keeps ^/$ per line on the whole buffer
+    return re.compile(pattern, re.MULTILINE), _LINE_SENSITIVE_RE.search(pattern) is not None
+
+
+def _candidate_lines(regex: re.Pattern, source_code: str, line_starts: List[int]) -> Iterator[int]:
+    """
+    Yield indexes of lines that may contain a match, in order.
+
+    Any match within a single line is also a match of the whole buffer at the
+    same offset, so searching the buffer from the start of a line finds the
+    first line that can possibly match; lines before it are skipped.
+    """
+    pos = 0
+    while True:
+        match = regex.search(source_code, pos)
+        if match is None:
+            return
+        idx = bisect.bisect_right(line_starts, match.start()) - 1
+        yield idx
+        if idx + 1 >= len(line_starts):
+            return
+        pos = line_starts[idx + 1]
 
 
 def match_patterns(source_code: str, rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -36,6 +77,11 @@ def match_patterns(source_code: str, rules: List[Dict[str, Any]]) -> List[Dict[s
     
     matches = []
     lines = source_code.split('\n')
+    # Offset of the first character of every line
+    line_starts = [0]
+    line_starts.extend(m.end() for m in re.finditer('\n', source_code))
+    # Context windows are shared by every match on the same line
+    context_cache: Dict[int, str] = {}
     
     for rule in rules:
         rule_id = rule.get('id', '')
@@ -48,19 +94,27 @@ def match_patterns(source_code: str, rules: List[Dict[str, Any]]) -> List[Dict[s
             continue
         
         try:
-            # Compile regex pattern
-            regex = re.compile(pattern)
+            regex, line_sensitive = _compile_rule_pattern(pattern)
+            if line_sensitive:
+                candidates = range(len(lines))
+            else:
+                candidates = _candidate_lines(regex, source_code, line_starts)
             
-            # Match against each line
-            for line_num, line in enumerate(lines, start=1):
+            # Match against each candidate line
+            for idx in candidates:
+                line_num = idx + 1
+                line = lines[idx]
                 # Find all matches in the line
                 for match in regex.finditer(line):
                     matched_text = match.group(0)
                     
                     # Get some context (surrounding lines if available)
-                    context_start = max(0, line_num - 2)
-                    context_end = min(len(lines), line_num + 2)
-                    context = '\n'.join(lines[context_start:context_end])
+                    context = context_cache.get(line_num)
+                    if context is None:
+                        context_start = max(0, line_num - 2)
+                        context_end = min(len(lines), line_num + 2)
+                        context = '\n'.join(lines[context_start:context_end])
+                        context_cache[line_num] = context
                     
                     matches.append({
                         'rule_id': rule_id,
@@ -85,6 +139,39 @@ def match_patterns(source_code: str, rules: List[Dict[str, Any]]) -> List[Dict[s
     return matches
 
 
+def match_patterns_cached(
+    source_code: str,
+    rules: List[Dict[str, Any]],
+    cache_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Match security patterns, reusing results for unchanged source and rules.
+    
+    Results are kept in an in-process LRU and, with cache_dir, on disk keyed by
+    hashes of the source and of the rules. This is a library entry point; the
+    analysis pipeline calls match_patterns().
+    
+    Args:
+        source_code: Source code as string
+        rules: Rule dictionaries, see match_patterns()
+        cache_dir: Optional directory for results keyed by content
+        
+    Returns:
+        List[Dict]: Matches as returned by match_patterns()
+    """
+    rules_text = json.dumps(rules, sort_keys=True, default=str)
+    cache_key = content_key('patterns', _CACHE_VERSION, rules_text, source_code)
+    matches = _memory_cache.get(cache_key)
+    if matches is None and cache_dir:
+        matches = load_cache(cache_dir, cache_key, 0)
+    if matches is None:
+        matches = match_patterns(source_code, rules)
+        if cache_dir:
+            save_cache(cache_dir, cache_key, matches)
+    _memory_cache.put(cache_key, matches)
+    return [dict(match) for match in matches]
+
+
 def load_rules_from_yaml(yaml_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Extract rules list from YAML data structure.
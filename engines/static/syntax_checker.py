@@ -5,17 +5,25 @@ Syntax Checker
 Checks Python source code for syntax errors using compile().
 """
 
+import ast
 import sys
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 
-def check_syntax(source_code: str, filename: str = "<unknown>") -> Dict[str, Any]:
+def check_syntax(
+    source_code: str,
+    filename: str = "<unknown>",
+    ast_tree: Optional[ast.AST] = None
+) -> Dict[str, Any]:
     """
     Check Python source code for syntax errors.
     
     Args:
         source_code: Python source code as string
         filename: Optional filename for error reporting
+        ast_tree: Optional tree already parsed from source_code. Only the
+            compile stage (e.g. 'return' outside function) is then run,
+            instead of parsing the source a second time.
         
     Returns:
         dict: Dictionary containing:
@@ -37,7 +45,7 @@ def check_syntax(source_code: str, filename: str = "<unknown>") -> Dict[str, Any
     
     try:
         # Try to compile the source code
-        compile(source_code, filename, 'exec')
+        compile(source_code if ast_tree is None else ast_tree, filename, 'exec')
         
         return {
             'valid': True,
@@ -8,6 +8,18 @@ Tracks data flow from taint sources (sys.argv, input) to dangerous sinks (os.sys
 import ast
 from typing import List, Dict, Any, Set, Optional
 
+from engines.analysis.cache_manager import MemoryCache, content_key, load_cache, save_cache
+
+# Part of every cache key; bump whenever the taint flow format changes
+_CACHE_VERSION = '1'
+_memory_cache = MemoryCache()
+
+# Names of taint sources and sinks
+_INPUT_FNS = frozenset({'input', 'raw_input'})
+_OS_SINKS = frozenset({'system', 'popen'})
+_SUBPROC_SINKS = frozenset({'call', 'run', 'Popen'})
+_EVAL_FNS = frozenset({'eval', 'exec'})
+
 
 class TaintAnalyzer(ast.NodeVisitor):
     """AST visitor for taint analysis."""
@@ -21,52 +33,102 @@ class TaintAnalyzer(ast.NodeVisitor):
     
     def _is_taint_source(self, node: ast.AST) -> bool:
         """Check if a node represents a taint source."""
+        # ast.parse never produces subclasses of node types, so exact type
+        # checks are equivalent to isinstance and cheaper
+        node_type = type(node)
+        
         # Check for sys.argv access
-        if isinstance(node, ast.Subscript):
-            if isinstance(node.value, ast.Attribute):
-                if isinstance(node.value.value, ast.Name) and node.value.value.id == 'sys':
-                    if node.value.attr == 'argv':
-                        return True
+        if node_type is ast.Subscript:
+            value = node.value
+            if type(value) is ast.Attribute and value.attr == 'argv':
+                owner = value.value
+                if type(owner) is ast.Name and owner.id == 'sys':
+                    return True
         
         # Check for input() call
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name):
-                if node.func.id in ('input', 'raw_input'):
+        elif node_type is ast.Call:
+            func = node.func
+            if type(func) is ast.Name:
+                if func.id in _INPUT_FNS:
                     return True
         
         return False
     
     def _is_taint_sink(self, node: ast.Call) -> Optional[str]:
         """Check if a call node represents a taint sink. Returns function name if yes."""
-        if isinstance(node.func, ast.Attribute):
+        func = node.func
+        func_type = type(func)
+        if func_type is ast.Attribute:
             # os.system, os.popen, etc.
-            if isinstance(node.func.value, ast.Name):
-                if node.func.value.id == 'os':
-                    if node.func.attr in ('system', 'popen'):
-                        return f"os.{node.func.attr}"
-                elif node.func.value.id == 'subprocess':
-                    if node.func.attr in ('call', 'run', 'Popen'):
-                        return f"subprocess.{node.func.attr}"
+            owner = func.value
+            if type(owner) is ast.Name:
+                if owner.id == 'os':
+                    if func.attr in _OS_SINKS:
+                        return f"os.{func.attr}"
+                elif owner.id == 'subprocess':
+                    if func.attr in _SUBPROC_SINKS:
+                        return f"subprocess.{func.attr}"
         
         # eval, exec calls
-        if isinstance(node.func, ast.Name):
-            if node.func.id in ('eval', 'exec'):
-                return node.func.id
+        elif func_type is ast.Name:
+            if func.id in _EVAL_FNS:
+                return func.id
         
         return None
     
     def _get_variable_name(self, node: ast.AST) -> Optional[str]:
         """Extract variable name from a node."""
-        if isinstance(node, ast.Name):
+        node_type = type(node)
+        if node_type is ast.Name:
             return node.id
-        elif isinstance(node, ast.Attribute):
+        elif node_type is ast.Attribute:
             # For attributes, return the full path
-            if isinstance(node.value, ast.Name):
-                return f"{node.value.id}.{node.attr}"
+            value = node.value
+            if type(value) is ast.Name:
+                return f"{value.id}.{node.attr}"
         return None
     
+    def run(self, ast_tree: ast.AST) -> None:
+        """
+        Analyze a tree without recursion.
+        
+        Nodes are handled in the same pre-order as visit(), so results are
+        identical, but deep trees cannot hit the recursion limit and only
+        Assign and Call nodes dispatch to a handler.
+        """
+        stack = [ast_tree]
+        pop = stack.pop
+        push = stack.append
+        AST = ast.AST
+        while stack:
+            node = pop()
+            node_type = type(node)
+            if node_type is ast.Assign:
+                self._on_assign(node)
+            elif node_type is ast.Call:
+                self._on_call(node)
+            # Children are pushed last-first so they pop in source order,
+            # matching ast.iter_child_nodes
+            for field in reversed(node._fields):
+                value = getattr(node, field, None)
+                if isinstance(value, AST):
+                    push(value)
+                elif type(value) is list:
+                    for item in reversed(value):
+                        if isinstance(item, AST):
+                            push(item)
+    
     def visit_Assign(self, node: ast.Assign):
         """Track variable assignments and taint propagation."""
+        self._on_assign(node)
+        self.generic_visit(node)
+    
+    def visit_Call(self, node: ast.Call):
+        """Detect taint sinks and check for taint flow."""
+        self._on_call(node)
+        self.generic_visit(node)
+    
+    def _on_assign(self, node: ast.Assign):
         # Check if the value is a taint source
         is_tainted = self._is_taint_source(node.value)
         
@@ -91,11 +153,8 @@ class TaintAnalyzer(ast.NodeVisitor):
                         'line': node.lineno,
                         'tainted_var': var_name
                     })
-        
-        self.generic_visit(node)
     
-    def visit_Call(self, node: ast.Call):
-        """Detect taint sinks and check for taint flow."""
+    def _on_call(self, node: ast.Call):
         sink_name = self._is_taint_sink(node)
         
         if sink_name:
@@ -133,32 +192,33 @@ class TaintAnalyzer(ast.NodeVisitor):
                         'type': 'variable_flow',
                         'tainted_var': var_name
                     })
-        
-        self.generic_visit(node)
     
     def _get_node_repr(self, node: ast.AST) -> str:
         """Get string representation of a node."""
-        if isinstance(node, ast.Name):
+        node_type = type(node)
+        if node_type is ast.Name:
             return node.id
-        elif isinstance(node, ast.Attribute):
-            if isinstance(node.value, ast.Name):
-                return f"{node.value.id}.{node.attr}"
-        elif isinstance(node, ast.Subscript):
-            if isinstance(node.value, ast.Attribute):
-                if isinstance(node.value.value, ast.Name):
-                    return f"{node.value.value.id}.{node.value.attr}[...]"
-        elif isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name):
-                return f"{node.func.id}(...)"
-        elif isinstance(node, ast.BinOp):
+        elif node_type is ast.Attribute:
+            value = node.value
+            if type(value) is ast.Name:
+                return f"{value.id}.{node.attr}"
+        elif node_type is ast.Subscript:
+            value = node.value
+            if type(value) is ast.Attribute:
+                owner = value.value
+                if type(owner) is ast.Name:
+                    return f"{owner.id}.{value.attr}[...]"
+        elif node_type is ast.Call:
+            func = node.func
+            if type(func) is ast.Name:
+                return f"{func.id}(...)"
+        elif node_type is ast.BinOp:
             # For string concatenation like "echo " + user_command
             left = self._get_node_repr(node.left)
             right = self._get_node_repr(node.right)
             return f"{left} + {right}"
-        elif isinstance(node, ast.Constant):
+        elif node_type is ast.Constant:
             return repr(node.value)
-        elif isinstance(node, ast.Str):  # Python < 3.8
-            return repr(node.s)
         
         return ast.dump(node)
 
@@ -183,6 +243,39 @@ def analyze(ast_tree: ast.AST) -> List[Dict[str, Any]]:
         return []
     
     analyzer = TaintAnalyzer()
-    analyzer.visit(ast_tree)
+    analyzer.run(ast_tree)
     
     return analyzer.taint_flows
+
+
+def analyze_cached(source_code: str, cache_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Perform taint analysis on Python source, reusing results for unchanged source.
+    
+    Results are kept in an in-process LRU and, with cache_dir, on disk keyed by a
+    hash of the source, so re-scanning a file skips parsing and the AST walk.
+    This is a library entry point; the analysis pipeline calls analyze().
+    
+    Args:
+        source_code: Python source code as string
+        cache_dir: Optional directory for results keyed by source content
+        
+    Returns:
+        List[Dict]: Taint flows as returned by analyze(); empty if the source
+            does not parse
+    """
+    cache_key = content_key('taint', _CACHE_VERSION, source_code)
+    flows = _memory_cache.get(cache_key)
+    if flows is None and cache_dir:
+        flows = load_cache(cache_dir, cache_key, 0)
+    if flows is None:
+        try:
+            ast_tree = ast.parse(source_code)
+        except (SyntaxError, ValueError):
+            ast_tree = None
+        flows = analyze(ast_tree)
+        if cache_dir:
+            save_cache(cache_dir, cache_key, flows)
+    _memory_cache.put(cache_key, flows)
+    # Callers may annotate the flows they get back; keep the cached copy intact
+    return [dict(flow) for flow in flows]
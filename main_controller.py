@@ -5,29 +5,30 @@ Main Controller
 Orchestrates the complete security analysis workflow.
 """
 
+import copy
+import json
+import mmap
 import os
+import re
+import threading
 import yaml
-from typing import Dict, Any, Optional
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, Tuple
+
+# libyaml-backed loader when PyYAML was built with it; same results, parsed in C
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
 
 # Preprocessing imports
 from engines.preprocessing.parser import read_file
 from engines.preprocessing.ast_builder import build_ast
-from engines.preprocessing.symbol_table import extract_symbols
-from engines.preprocessing.ir_generator import generate as generate_ir
+from engines.preprocessing.combined_visitor import CombinedVisitor
 from engines.preprocessing.language_detector import detect_language, is_supported_language
 
-# Go language imports
-from engines.preprocessing.go_ast_builder import build_ast as build_go_ast
-from engines.static.go_syntax_checker import check_syntax as check_go_syntax
-from engines.static.go_taint_analysis import analyze as go_taint_analyze
-from engines.static.go_cfg_analysis import analyze as go_cfg_analyze
-
-# Java language imports
-from engines.preprocessing.java_ast_builder import build_ast as build_java_ast
-from engines.static.java_syntax_checker import check_syntax as check_java_syntax
-from engines.static.java_taint_analysis import analyze as java_taint_analyze
-from engines.static.java_cfg_analysis import analyze as java_cfg_analyze
-
 # Static analysis imports
 from engines.static.syntax_checker import check_syntax
 from engines.static.pattern_matcher import (
@@ -36,16 +37,6 @@ from engines.static.pattern_matcher import (
     filter_rules_by_language
 )
 from engines.static.taint_analysis import analyze as taint_analyze
-from engines.static.cfg_analysis import analyze as cfg_analyze
-
-# Dynamic analysis imports
-from engines.dynamic.sandbox import run_in_sandbox, run_direct
-from engines.dynamic.network_monitor import analyze_network_activity
-from engines.dynamic.fuzzer import fuzz_execution
-from engines.dynamic.file_monitor import analyze_file_activity
-from engines.dynamic.memory_analyzer import analyze_memory
-from engines.dynamic.go_dynamic_runner import run_go_dynamic
-from engines.dynamic.java_dynamic_runner import run_java_dynamic
 
 # Analysis imports
 from engines.analysis.aggregator import aggregate_results
@@ -53,18 +44,255 @@ from engines.analysis.threat_identifier import identify_threats
 from engines.analysis.risk_assessor import assess_risk, assess_risk_from_counts
 from engines.analysis.report_renderer import (
     build_single_report_data,
-    generate_json_report,
+    iter_json_report,
     generate_html_report,
     generate_markdown_report,
     save_report
 )
-from engines.analysis.ai_agent import run_agent_analysis
 
 # Dependency checking imports
-from engines.static.dependency_checker import check_dependencies
-from engines.static.cve_matcher import match_cve
+from engines.static.dependency_checker import check_dependencies, check_dependencies_many
 
+# Go/Java engines, dynamic analysis, the AI agent and CVE matching (which pulls
+# in requests) are imported where they are used, so a run only loads what it needs
 
+
+# Shared pool for analysis stages that mostly wait on I/O, created on first use
+_STAGE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_DEFAULT_STAGE_WORKERS = 4
+_STAGE_EXECUTOR_LOCK = threading.Lock()
+
+# A line whose first non-blank character does not open a comment; a lone
+# '\r' also ends a line, as in text mode
+_CODE_LINE_RE = re.compile(rb'(?m)(?:^|\r)\s*(?!#|//|/\*|\*)\S')
+_EMPTY_CHECK_HEAD_BYTES = 4096
+
+# Report formats written when settings do not list 'report_formats'
+_REPORT_FORMATS = ('json', 'html', 'markdown')
+
+# Severity buckets of a risk breakdown, most severe first
+_SEVERITY_LEVELS = ('critical', 'high', 'medium', 'low')
+
+# Output directories already created by this process
+_MADE_DIRS = set()
+
+# Parsed YAML by (absolute path, mtime, size); edited files get a new key
+_YAML_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
+
+def _load_yaml_file(path: str, mtime_ns: int) -> Any:
+    """
+    Parse a YAML file, going through a JSON copy in a .cache directory next
+    to it so fresh processes skip the YAML parser. The copy's name carries the
+    source mtime, so editing the YAML makes it miss. Set OSS_GUARDIAN_NO_CACHE
+    to bypass it.
+    """
+    use_sidecar = not os.environ.get('OSS_GUARDIAN_NO_CACHE')
+    sidecar_dir = os.path.join(os.path.dirname(path), '.cache')
+    name = os.path.basename(path)
+    sidecar_path = os.path.join(sidecar_dir, f"{name}.{mtime_ns}.json")
+    if use_sidecar:
+        try:
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YAMLLoader)
+    if use_sidecar:
+        _write_yaml_sidecar(data, sidecar_dir, name, sidecar_path)
+    return data
+
+
+def _write_yaml_sidecar(data: Any, sidecar_dir: str, name: str, sidecar_path: str) -> None:
+    try:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        # Dates, non-string keys and the like do not survive JSON; skip those files
+        if json.loads(text) != data:
+            return
+        os.makedirs(sidecar_dir, exist_ok=True)
+        tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, sidecar_path)
+        # Copies made for earlier versions of the file are never read again
+        for entry in os.scandir(sidecar_dir):
+            if (entry.name.startswith(name + '.') and entry.name.endswith('.json')
+                    and entry.path != sidecar_path):
+                os.remove(entry.path)
+    except (TypeError, ValueError, OSError):
+        pass
+
+
+def _load_yaml_cached(path: str) -> Any:
+    """Parse a YAML file once per process for as long as it is unchanged."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _YAML_CACHE:
+        _YAML_CACHE[key] = _load_yaml_file(path, stat.st_mtime_ns)
+    # Callers adjust the config they get back; keep the cached copy intact
+    return copy.deepcopy(_YAML_CACHE[key])
+
+
+def _start_stage(settings: Dict[str, Any], func: Callable[..., Any], *args: Any) -> Future:
+    """
+    Start an analysis stage that mostly waits on I/O (network lookups, compiler
+    processes). With 'parallel_analysis' enabled it runs on a shared thread pool
+    while the caller carries on with the in-process stages; otherwise it runs
+    immediately. Either way the result or exception comes from the future.
+    The pool is shared by every analysis in the process and sized from
+    'parallel_workers' when it is first created.
+    """
+    global _STAGE_EXECUTOR
+    if settings.get('parallel_analysis', True):
+        with _STAGE_EXECUTOR_LOCK:
+            if _STAGE_EXECUTOR is None:
+                workers = settings.get('parallel_workers') or _DEFAULT_STAGE_WORKERS
+                _STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stage')
+        return _STAGE_EXECUTOR.submit(func, *args)
+    return _run_inline(func, *args)
+
+
+def _run_inline(func: Callable[..., Any], *args: Any) -> Future:
+    """Run func now and hand back its result or exception as a completed future."""
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+# Per-language static stages. Syntax starters return a future so checks that
+# shell out (gofmt, javac) overlap the in-process stages; the Go and Java
+# engines are imported on first use.
+
+def _python_syntax(settings: Dict[str, Any], file_path: str, source_code: str, ast_tree: Any) -> Future:
+    return _run_inline(check_syntax, source_code, file_path, ast_tree)
+
+
+def _python_taint(file_path: str, source_code: str, ast_tree: Any) -> list:
+    return taint_analyze(ast_tree)
+
+
+def _go_syntax(settings: Dict[str, Any], file_path: str, source_code: str, ast_tree: Any) -> Future:
+    from engines.static.go_syntax_checker import check_syntax as check_go_syntax
+    return _start_stage(settings, check_go_syntax, file_path)
+
+
+def _go_taint(file_path: str, source_code: str, ast_tree: Any) -> list:
+    from engines.static.go_taint_analysis import analyze as go_taint_analyze
+    return go_taint_analyze(file_path, source_code=source_code)
+
+
+def _go_cfg(source_code: str) -> list:
+    from engines.static.go_cfg_analysis import analyze as go_cfg_analyze
+    return go_cfg_analyze(source_code)
+
+
+def _java_syntax(settings: Dict[str, Any], file_path: str, source_code: str, ast_tree: Any) -> Future:
+    from engines.static.java_syntax_checker import check_syntax_source as check_java_syntax_source
+    return _start_stage(settings, check_java_syntax_source, source_code, os.path.basename(file_path))
+
+
+def _java_taint(file_path: str, source_code: str, ast_tree: Any) -> list:
+    from engines.static.java_taint_analysis import analyze as java_taint_analyze
+    return java_taint_analyze(file_path, source_code=source_code)
+
+
+def _java_cfg(source_code: str) -> list:
+    from engines.static.java_cfg_analysis import analyze as java_cfg_analyze
+    return java_cfg_analyze(source_code)
+
+
+# 'cfg' is None when the structures come from preprocessing (Python's combined
+# visitor). Go/Java taint flows carry rule_ids that threat identification reads
+# from the pattern matches, so they are merged in ('merge_taint').
+_STATIC_PIPELINES: Dict[str, Dict[str, Any]] = {
+    'python': {'syntax': _python_syntax, 'taint': _python_taint, 'cfg': None, 'merge_taint': False},
+    'go': {'syntax': _go_syntax, 'taint': _go_taint, 'cfg': _go_cfg, 'merge_taint': True},
+    'java': {'syntax': _java_syntax, 'taint': _java_taint, 'cfg': _java_cfg, 'merge_taint': True},
+}
+
+
+def _lookup_dependencies(file_path: str, language: str) -> Tuple[list, list]:
+    """Collect a file's dependencies and the CVEs that match them."""
+    from engines.static.cve_matcher import match_cve
+    dependencies = check_dependencies(file_path, language)
+    cve_matches = match_cve(dependencies, language=language) if dependencies else []
+    return dependencies, cve_matches
+
+
+def _lookup_project_dependencies(file_paths: list, language: str) -> Tuple[list, list]:
+    """Collect the dependencies of every project touched by file_paths, and their CVEs."""
+    from engines.static.cve_matcher import match_cve
+    dependencies = check_dependencies_many(file_paths, language)
+    cve_matches = (match_cve(dependencies, language=language) or []) if dependencies else []
+    return dependencies, cve_matches
+
+
+def _read_log_lines(log_file: Optional[str]) -> list:
+    """Lines of a sandbox log file as the dynamic analyzers read them; [] if unreadable."""
+    if not log_file:
+        return []
+    try:
+        with open(log_file, 'r', encoding='utf-8') as f:
+            return f.readlines()
+    except Exception:
+        return []
+
+
+def _ensure_dir(path: str) -> None:
+    """Create path once per process; save_report still recreates it if it is removed."""
+    if path not in _MADE_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _MADE_DIRS.add(path)
+
+
+def _render_report(render: Callable[[Dict[str, Any]], Any], report_data: Dict[str, Any],
+                   path: str, fmt: str) -> str:
+    """Render one report format and write it to disk, returning the saved path."""
+    return save_report(render(report_data), path, fmt)
+
+
+def _save_reports(settings: Dict[str, Any], report_data: Dict[str, Any], stem: str) -> Dict[str, str]:
+    """
+    Write the reports for report_data in the formats listed by
+    'report_formats' (JSON, HTML and Markdown by default). The formats only
+    read report_data, so they are rendered and written side by side; the
+    JSON report is streamed to disk in chunks.
+    """
+    formats = settings.get('report_formats') or _REPORT_FORMATS
+    if isinstance(formats, str):
+        formats = [formats]
+    formats = {fmt.lower() for fmt in formats}
+    jobs = [
+        (fmt, _start_stage(settings, _render_report, render, report_data, f"{stem}.{ext}", fmt))
+        for fmt, ext, render in (
+            ('json', 'json', iter_json_report),
+            ('html', 'html', generate_html_report),
+            ('markdown', 'md', generate_markdown_report),
+        )
+        if fmt in formats
+    ]
+    return {fmt: job.result() for fmt, job in jobs}
+
+
+def _threat_key(threat: Dict[str, Any]) -> tuple:
+    """Identity of a threat for de-duplication across rule and AI findings."""
+    return (
+        threat.get('threat_type'),
+        threat.get('severity'),
+        threat.get('description'),
+        tuple(threat.get('line_numbers') or ()),
+        tuple(
+            (ev.get('file'), ev.get('line')) for ev in (threat.get('evidence') or ())
+            if isinstance(ev, dict)
+        )
+    )
+
+
 def load_config(config_dir: str = 'config') -> Dict[str, Any]:
     """
     Load configuration from YAML files.
@@ -80,8 +308,7 @@ def load_config(config_dir: str = 'config') -> Dict[str, Any]:
     # Load settings
     settings_path = os.path.join(config_dir, 'settings.yaml')
     if os.path.exists(settings_path):
-        with open(settings_path, 'r', encoding='utf-8') as f:
-            config['settings'] = yaml.safe_load(f)
+        config['settings'] = _load_yaml_cached(settings_path)
     else:
         config['settings'] = {
             'timeout': 30,
@@ -93,23 +320,22 @@ def load_config(config_dir: str = 'config') -> Dict[str, Any]:
             'dynamic_timeout': 2,
             'dynamic_log_mode': 'queue',
             'parallel_analysis': True,
-            'parallel_workers': None
+            'parallel_workers': None,
+            'report_formats': list(_REPORT_FORMATS)
         }
     
     # Load rules
     rules_path = os.path.join(config_dir, 'rules.yaml')
     if os.path.exists(rules_path):
-        with open(rules_path, 'r', encoding='utf-8') as f:
-            config['rules'] = yaml.safe_load(f)
+        config['rules'] = _load_yaml_cached(rules_path)
     else:
         config['rules'] = {'rules': []}
 
     # Load agent config
     agent_path = os.path.join(config_dir, 'agent.yaml')
     if os.path.exists(agent_path):
-        with open(agent_path, 'r', encoding='utf-8') as f:
-            agent_data = yaml.safe_load(f) or {}
-            config['agent'] = agent_data.get('agent', {})
+        agent_data = _load_yaml_cached(agent_path) or {}
+        config['agent'] = agent_data.get('agent', {})
     else:
         config['agent'] = {
             'enabled': False,
@@ -183,17 +409,20 @@ def analyze_file(
     def is_effectively_empty(path: str) -> bool:
         """Return True if file has no code (only whitespace/comments)."""
         try:
-            if os.path.getsize(path) == 0:
+            size = os.path.getsize(path)
+            if size == 0:
                 return True
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    stripped = line.strip()
-                    if not stripped:
-                        continue
-                    if stripped.startswith(('#', '//', '/*', '*', '*/')):
-                        continue
+            with open(path, 'rb') as f:
+                # Most files show code in their first complete lines
+                head = f.read(_EMPTY_CHECK_HEAD_BYTES)
+                if len(head) == size:
+                    return _CODE_LINE_RE.search(head) is None
+                cut = head.rfind(b'\n')
+                if cut != -1 and _CODE_LINE_RE.search(head, 0, cut) is not None:
                     return False
-            return True
+                # Scan the mapped bytes in C instead of decoding line objects
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return _CODE_LINE_RE.search(data) is None
         except Exception:
             return False
     
@@ -252,6 +481,7 @@ def analyze_file(
         ast_tree = None
         symbols = {}
         ir = []
+        cfg_structures = []
         syntax_result = {'valid': True, 'errors': []}
         if not dependency_only:
             source_code = read_file(file_path)
@@ -261,19 +491,19 @@ def analyze_file(
                 print("[INFO] Building AST...")
                 ast_tree = build_ast(source_code, filename=file_path)
                 
-                print("[INFO] Extracting symbols...")
-                symbols = extract_symbols(ast_tree)
-                
-                print("[INFO] Generating IR...")
-                ir = generate_ir(ast_tree)
+                # Symbols, IR and CFG structures are collected in one traversal
+                print("[INFO] Extracting symbols and generating IR...")
+                ir, symbols, cfg_structures = CombinedVisitor.run(ast_tree)
             elif language == 'go':
+                from engines.preprocessing.go_ast_builder import build_ast as build_go_ast
                 print("[INFO] Building Go AST...")
-                ast_tree = build_go_ast(file_path)
+                ast_tree = build_go_ast(file_path, source_code=source_code)
                 symbols = ast_tree.get('functions', []) + ast_tree.get('variables', [])
                 ir = []  # Go IR generation can be added later
             elif language == 'java':
+                from engines.preprocessing.java_ast_builder import build_ast as build_java_ast
                 print("[INFO] Building Java AST...")
-                ast_tree = build_java_ast(file_path)
+                ast_tree = build_java_ast(file_path, source_code=source_code)
                 symbols = ast_tree.get('classes', []) + ast_tree.get('methods', []) + ast_tree.get('variables', [])
                 ir = []  # Java IR generation can be added later
             else:
@@ -283,106 +513,42 @@ def analyze_file(
         if enable_static:
             print("[INFO] Performing static analysis...")
             
-            # Language-specific static analysis
-            if language == 'python':
-                if dependency_only:
-                    dependencies = check_dependencies(file_path, language)
-                    cve_matches = match_cve(dependencies, language=language) if dependencies else []
-                    results['static_results'] = {
-                        'pattern_matches': [],
-                        'taint_flows': [],
-                        'cfg_structures': [],
-                        'syntax_valid': True,
-                        'syntax_errors': [],
-                        'symbols': {},
-                        'ir': [],
-                        'dependencies': dependencies,
-                        'cve_matches': cve_matches
-                    }
-                else:
-                    # Syntax check
-                    syntax_result = check_syntax(source_code, filename=file_path)
-                    
-                    # Pattern matching
-                    rules = load_rules_from_yaml(rules_data)
-                    rules = filter_rules_by_language(rules, language)
-                    pattern_matches = match_patterns(source_code, rules)
-                    
-                    # Taint analysis
-                    taint_flows = taint_analyze(ast_tree)
-                    
-                    # CFG analysis
-                    cfg_structures = cfg_analyze(ast_tree)
-                    
-                    # Dependency checking
-                    dependencies = check_dependencies(file_path, language)
-                    cve_matches = match_cve(dependencies, language=language) if dependencies else []
-                    
-                    results['static_results'] = {
-                        'pattern_matches': pattern_matches,
-                        'taint_flows': taint_flows,
-                        'cfg_structures': cfg_structures,
-                        'syntax_valid': syntax_result['valid'],
-                        'syntax_errors': syntax_result.get('errors', []),
-                        'symbols': symbols,
-                        'ir': ir,
-                        'dependencies': dependencies,
-                        'cve_matches': cve_matches
-                    }
-            elif language == 'go':
-                # Go syntax check
-                syntax_result = check_go_syntax(file_path)
-                
-                # Pattern matching (use same rules, filter by language if needed)
-                rules = load_rules_from_yaml(rules_data)
-                go_rules = filter_rules_by_language(rules, language)
-                pattern_matches = match_patterns(source_code, go_rules)
-                
-                # Go taint analysis
-                taint_flows = go_taint_analyze(file_path)
-
-                # Merge taint flows into pattern matches for threat identification
-                pattern_matches.extend(taint_flows)
-                
-                # CFG analysis for Go (heuristic)
-                cfg_structures = go_cfg_analyze(source_code)
-                
-                # Dependency checking
-                dependencies = check_dependencies(file_path, language)
-                cve_matches = match_cve(dependencies, language=language) if dependencies else []
-                
+            if dependency_only:
+                dependencies, cve_matches = _lookup_dependencies(file_path, language)
                 results['static_results'] = {
-                    'pattern_matches': pattern_matches,
-                    'taint_flows': taint_flows,
-                    'cfg_structures': cfg_structures,
-                    'syntax_valid': syntax_result['valid'],
-                    'syntax_errors': syntax_result.get('errors', []),
-                    'symbols': symbols,
-                    'ir': ir,
+                    'pattern_matches': [],
+                    'taint_flows': [],
+                    'cfg_structures': [],
+                    'syntax_valid': True,
+                    'syntax_errors': [],
+                    'symbols': {},
+                    'ir': [],
                     'dependencies': dependencies,
                     'cve_matches': cve_matches
                 }
-            elif language == 'java':
-                # Java syntax check
-                syntax_result = check_java_syntax(file_path)
+            else:
+                pipeline = _STATIC_PIPELINES[language]
+                
+                # Dependency checking and external syntax checks run alongside the in-process stages
+                dependency_job = _start_stage(settings, _lookup_dependencies, file_path, language)
+                syntax_job = pipeline['syntax'](settings, file_path, source_code, ast_tree)
                 
                 # Pattern matching
                 rules = load_rules_from_yaml(rules_data)
-                java_rules = filter_rules_by_language(rules, language)
-                pattern_matches = match_patterns(source_code, java_rules)
+                rules = filter_rules_by_language(rules, language)
+                pattern_matches = match_patterns(source_code, rules)
                 
-                # Java taint analysis
-                taint_flows = java_taint_analyze(file_path)
-
-                # Merge taint flows into pattern matches for threat identification
-                pattern_matches.extend(taint_flows)
+                # Taint analysis
+                taint_flows = pipeline['taint'](file_path, source_code, ast_tree)
+                if pipeline['merge_taint']:
+                    pattern_matches.extend(taint_flows)
                 
-                # CFG analysis for Java (heuristic)
-                cfg_structures = java_cfg_analyze(source_code)
+                # CFG analysis (heuristic for Go/Java)
+                if pipeline['cfg'] is not None:
+                    cfg_structures = pipeline['cfg'](source_code)
                 
-                # Dependency checking
-                dependencies = check_dependencies(file_path, language)
-                cve_matches = match_cve(dependencies, language=language) if dependencies else []
+                syntax_result = syntax_job.result()
+                dependencies, cve_matches = dependency_job.result()
                 
                 results['static_results'] = {
                     'pattern_matches': pattern_matches,
@@ -412,6 +578,12 @@ def analyze_file(
             print("[INFO] Performing dynamic analysis...")
 
             if language == 'python':
+                from engines.dynamic.sandbox import run_in_sandbox
+                from engines.dynamic.network_monitor import analyze_network_activity
+                from engines.dynamic.fuzzer import fuzz_execution
+                from engines.dynamic.file_monitor import analyze_file_activity
+                from engines.dynamic.memory_analyzer import analyze_memory
+                
                 # Run with hook runner; isolation is optional
                 sandbox_result = run_in_sandbox(
                     file_path=file_path,
@@ -420,23 +592,21 @@ def analyze_file(
                     log_mode=dynamic_log_mode
                 )
 
+                # Without in-memory entries the log file is read once for all analyzers
+                log_entries = sandbox_result.get('log_entries', [])
+                log_lines = log_entries or _read_log_lines(sandbox_result.get('log_file'))
+
                 # Analyze network activity
                 network_activities = []
-                log_entries = sandbox_result.get('log_entries', [])
-                if log_entries:
-                    network_activities = analyze_network_activity(log_entries)
-                elif sandbox_result.get('log_file'):
-                    network_activities = analyze_network_activity(sandbox_result['log_file'])
+                if log_lines:
+                    network_activities = analyze_network_activity(log_lines)
 
                 # Analyze file activity and memory signals
                 file_activities = []
                 memory_findings = []
-                if log_entries:
-                    file_activities = analyze_file_activity(log_entries)
-                    memory_findings = analyze_memory(log_source=log_entries)
-                elif sandbox_result.get('log_file'):
-                    file_activities = analyze_file_activity(sandbox_result['log_file'])
-                    memory_findings = analyze_memory(log_source=sandbox_result['log_file'])
+                if log_lines:
+                    file_activities = analyze_file_activity(log_lines)
+                    memory_findings = analyze_memory(log_source=log_lines)
 
                 # Fuzz testing
                 fuzz_results = fuzz_execution(
@@ -448,11 +618,10 @@ def analyze_file(
                 )
 
                 # Extract syscalls from log
-                syscalls = []
-                if sandbox_result.get('log_entries'):
-                    for entry in sandbox_result['log_entries']:
-                        if '[ALERT] SYSCALL:' in entry or '[ALERT] NETWORK:' in entry:
-                            syscalls.append(entry.strip())
+                syscalls = [
+                    entry.strip() for entry in log_entries or ()
+                    if '[ALERT] SYSCALL:' in entry or '[ALERT] NETWORK:' in entry
+                ]
 
                 results['dynamic_results'] = {
                     'syscalls': syscalls,
@@ -466,6 +635,7 @@ def analyze_file(
                 if not enable_sandbox:
                     results['dynamic_results']['note'] = 'Sandbox disabled; hooks enabled without isolation.'
             elif language == 'go':
+                from engines.dynamic.go_dynamic_runner import run_go_dynamic
                 results['dynamic_results'] = run_go_dynamic(
                     file_path=file_path,
                     args=[],
@@ -473,6 +643,7 @@ def analyze_file(
                     sample_interval=dynamic_sample_interval
                 )
             elif language == 'java':
+                from engines.dynamic.java_dynamic_runner import run_java_dynamic
                 results['dynamic_results'] = run_java_dynamic(
                     file_path=file_path,
                     args=[],
@@ -520,30 +691,13 @@ def analyze_file(
         # Step 5: Generate Reports
         print("[INFO] Generating reports...")
         report_data = build_single_report_data(file_path, results)
-        
-        # Generate JSON report
-        json_report = generate_json_report(report_data)
         report_dir = settings.get('report_path', 'data/reports/')
-        os.makedirs(report_dir, exist_ok=True)
+        _ensure_dir(report_dir)
         
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         base_name = os.path.splitext(os.path.basename(file_path))[0]
-        json_path = os.path.join(report_dir, f"{base_name}_{timestamp}.json")
-        json_path = save_report(json_report, json_path, 'json')
-        results['reports']['json'] = json_path
-        
-        # Generate HTML report
-        html_report = generate_html_report(report_data)
-        html_path = os.path.join(report_dir, f"{base_name}_{timestamp}.html")
-        html_path = save_report(html_report, html_path, 'html')
-        results['reports']['html'] = html_path
-        
-        # Generate Markdown report
-        markdown_report = generate_markdown_report(report_data)
-        markdown_path = os.path.join(report_dir, f"{base_name}_{timestamp}.md")
-        markdown_path = save_report(markdown_report, markdown_path, 'markdown')
-        results['reports']['markdown'] = markdown_path
+        stem = os.path.join(report_dir, f"{base_name}_{timestamp}")
+        results['reports'].update(_save_reports(settings, report_data, stem))
         
         print(f"[SUCCESS] Analysis complete. Risk score: {risk_assessment['risk_score']}/100")
         
@@ -585,24 +739,30 @@ def analyze_multiple_files(
     except Exception:
         project_label = 'zip_project'
 
-    dependencies = []
-    cve_matches = []
+    settings = config.get('settings', {})
     languages = {}
     for path in file_paths:
         lang = detect_language(path)
         languages.setdefault(lang, []).append(path)
-    for lang, paths in languages.items():
-        if lang not in ('python', 'go', 'java'):
-            continue
+    # One lookup per language covering every project root, overlapped with the agent run.
+    dependency_jobs = [
+        _start_stage(settings, _lookup_project_dependencies, paths, lang)
+        for lang, paths in languages.items()
+        if lang in ('python', 'go', 'java')
+    ]
+
+    from engines.analysis.ai_agent import run_agent_analysis
+    ai_threats, dynamic_results, _ = run_agent_analysis(file_paths, config)
+
+    dependencies = []
+    cve_matches = []
+    for job in dependency_jobs:
         try:
-            deps = check_dependencies(paths[0], lang)
-            if deps:
-                dependencies.extend(deps)
-                cve_matches.extend(match_cve(deps, language=lang) or [])
+            deps, cves = job.result()
         except Exception:
             continue
-
-    ai_threats, dynamic_results, _ = run_agent_analysis(file_paths, config)
+        dependencies.extend(deps)
+        cve_matches.extend(cves)
 
     static_results = {
         'pattern_matches': [],
@@ -623,30 +783,9 @@ def analyze_multiple_files(
 
     def merge_threats(existing, incoming):
         merged = list(existing or [])
-        seen = set()
-        for threat in merged:
-            key = (
-                threat.get('threat_type'),
-                threat.get('severity'),
-                threat.get('description'),
-                tuple(threat.get('line_numbers') or []),
-                tuple(
-                    (ev.get('file'), ev.get('line')) for ev in (threat.get('evidence') or [])
-                    if isinstance(ev, dict)
-                )
-            )
-            seen.add(key)
+        seen = {_threat_key(threat) for threat in merged}
         for threat in incoming or []:
-            key = (
-                threat.get('threat_type'),
-                threat.get('severity'),
-                threat.get('description'),
-                tuple(threat.get('line_numbers') or []),
-                tuple(
-                    (ev.get('file'), ev.get('line')) for ev in (threat.get('evidence') or [])
-                    if isinstance(ev, dict)
-                )
-            )
+            key = _threat_key(threat)
             if key in seen:
                 continue
             seen.add(key)
@@ -656,18 +795,12 @@ def analyze_multiple_files(
     threats = merge_threats(rule_threats, ai_threats)
 
     summary = aggregated_results.get('summary', {}) or {}
-    ai_breakdown = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
-    for threat in ai_threats or []:
-        sev = (threat.get('severity') or 'medium').lower()
-        if sev not in ai_breakdown:
-            sev = 'medium'
-        ai_breakdown[sev] += 1
+    ai_severities = ((threat.get('severity') or 'medium').lower() for threat in ai_threats or ())
+    ai_breakdown = Counter(sev if sev in _SEVERITY_LEVELS else 'medium' for sev in ai_severities)
 
     combined_breakdown = {
-        'critical': int(summary.get('critical_count', 0)) + ai_breakdown['critical'],
-        'high': int(summary.get('high_count', 0)) + ai_breakdown['high'],
-        'medium': int(summary.get('medium_count', 0)) + ai_breakdown['medium'],
-        'low': int(summary.get('low_count', 0)) + ai_breakdown['low']
+        level: int(summary.get(f'{level}_count', 0)) + ai_breakdown[level]
+        for level in _SEVERITY_LEVELS
     }
     risk_assessment = assess_risk_from_counts(combined_breakdown)
 
@@ -684,22 +817,11 @@ def analyze_multiple_files(
 
     report_data = build_single_report_data(project_label, results)
     report_dir = config.get('settings', {}).get('report_path', 'data/reports/')
-    os.makedirs(report_dir, exist_ok=True)
-    from datetime import datetime
+    _ensure_dir(report_dir)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_name = os.path.basename(project_label) or "zip_project"
-
-    json_report = generate_json_report(report_data)
-    json_path = os.path.join(report_dir, f"{base_name}_{timestamp}.json")
-    results['reports']['json'] = save_report(json_report, json_path, 'json')
-
-    html_report = generate_html_report(report_data)
-    html_path = os.path.join(report_dir, f"{base_name}_{timestamp}.html")
-    results['reports']['html'] = save_report(html_report, html_path, 'html')
-
-    markdown_report = generate_markdown_report(report_data)
-    markdown_path = os.path.join(report_dir, f"{base_name}_{timestamp}.md")
-    results['reports']['markdown'] = save_report(markdown_report, markdown_path, 'markdown')
+    stem = os.path.join(report_dir, f"{base_name}_{timestamp}")
+    results['reports'].update(_save_reports(settings, report_data, stem))
 
     return results
 